@@ -8,6 +8,8 @@ checks, etc. per instrument.
 Tested on M8190A, M8195A, M8196A, N5182B, E8257D, M9383A, N5193A, N5194A
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import socketscpi
 import pyvisa
@@ -49,6 +51,47 @@ def wraparound_calc(length, gran, minLen):
     return repeats
 
 
+def wfm_scaler(wfm, binMult, binShift=0, dtype=np.int16, out=None):
+    """
+    HELPER FUNCTION
+    Applies the binary multiplier, casts to the generator's integer type, and
+    shifts samples over if required. The multiply writes straight into the
+    integer output array, so no full size floating point temporary is created.
+    Waveforms longer than a few megasamples are scaled in parallel blocks.
+    The multiply runs in the precision of wfm (float32 samples are not upcast to
+    float64), the same as np.array(binMult * wfm, dtype=dtype), so the output is
+    bit-identical to that expression for float32 and float64 input alike.
+    Args:
+        wfm (NumPy array): Unscaled floating point waveform samples.
+        binMult (int): Binary multiplier, determined by signal generator class.
+        binShift (int): Number of bits to shift samples to the left.
+        dtype (NumPy dtype): Integer data type expected by the signal generator.
+        out (NumPy array): Optional array of the same length as wfm to write the result into.
+
+    Returns:
+        (NumPy array): Scaled and formatted waveform samples.
+    """
+
+    if out is None:
+        out = np.empty(len(wfm), dtype=dtype)
+
+    def scale_block(block):
+        # Casting to an integer type truncates toward zero, same as np.array(binMult * wfm, dtype=dtype)
+        np.multiply(wfm[block], binMult, out=out[block], casting="unsafe")
+        if binShift:
+            np.left_shift(out[block], binShift, out=out[block])
+
+    # NumPy releases the GIL inside ufuncs, so long waveforms are split into 1 MSa+ blocks and scaled on several threads
+    numThreads = min(os.cpu_count() or 1, len(wfm) // 2 ** 20)
+    if numThreads > 1:
+        edges = np.linspace(0, len(wfm), numThreads + 1, dtype=int)
+        with ThreadPoolExecutor(max_workers=numThreads) as pool:
+            list(pool.map(scale_block, [slice(start, stop) for start, stop in zip(edges[:-1], edges[1:])]))
+    else:
+        scale_block(slice(None))
+    return out
+
+
 class SignalGeneratorBase:
     def __init__(self, ipAddress, apiType="socketscpi", timeout=10, **kwargs):
             """
@@ -97,6 +140,11 @@ class SignalGeneratorBase:
             
             self.instId = self.instance.query("*idn?")
 
+            # Reused by download_wfm() so back to back downloads don't allocate a new output array each time
+            self.wfmBuffer = None
+            # Next free AWG segment number for each channel, populated from the segment catalog by next_segment()
+            self.nextSegment = {}
+
     def __getattr__(self, __name: str):
         """This is a passthrough method that allows the base class to access attributes from the parent class.
         See the accepted answer at
@@ -104,7 +152,8 @@ class SignalGeneratorBase:
         return self.instance.__getattribute__(__name)
         
     def err_check(self):
-        """Prints out all errors and clears error queue. Raises InstrumentError with the info of the error encountered."""
+        """Prints out all errors and clears error queue. Raises InstrumentError with the info of the error encountered.
+        The locally tracked segment numbers are cleared whenever an error is found."""
 
         err = []
         cmd = 'SYST:ERR?'
@@ -120,8 +169,139 @@ class SignalGeneratorBase:
             temp = self.query(cmd)
             temp = temp.strip().replace('+', '').replace('-', '')
         if err:
+            # A failed segment definition can't be told apart from other errors, so stop trusting the local segment count
+            self.clear_segment_cache()
             raise error.InstrumentError(err)
 
+    def query_multiple(self, cmds):
+        """
+        HELPER FUNCTION
+        Sends several queries as a single compound SCPI query so they only cost one round trip.
+        Falls back to sending the queries one at a time if the instrument reports an error for the
+        compound query or doesn't return one response per query. The error queue is cleared (*CLS)
+        before falling back so a later err_check() doesn't report the rejected compound query.
+        Timeouts are not caught, a reply that arrives late would leave the queries that follow out of sync.
+
+        Compound queries are standard IEEE 488.2/SCPI syntax and are used by configure() in the
+        M8190A, M8195A, and VSG classes. They have only been checked against simulated instruments,
+        not hardware, which is why the fallback exists.
+        Args:
+            cmds (list): SCPI queries to be sent, each ending in '?'.
+
+        Returns:
+            (list): Stripped string responses in the same order as cmds.
+        """
+
+        # The leading colon resets the SCPI command tree so each query is interpreted from the root
+        try:
+            response = self.query(";:".join(cmds)).strip().split(";")
+        except (socketscpi.SockInstError, error.InstrumentError):
+            # The instrument answered but flagged the compound query, the fallback below handles it
+            response = []
+        if len(response) != len(cmds):
+            # Clear the error the rejected compound query left in the error queue
+            self.write("*cls")
+            response = [self.query(cmd) for cmd in cmds]
+        return [r.strip() for r in response]
+
+    def query_float(self, cmd):
+        """
+        HELPER FUNCTION
+        Sends a query and converts the first field of the response to a float.
+        Args:
+            cmd (str): SCPI query to be sent.
+
+        Returns:
+            (float): Numeric response from the instrument.
+        """
+
+        # float() ignores surrounding whitespace and partition() doesn't build a list like split() does
+        return float(self.query(cmd).partition(",")[0])
+
+    def query_int(self, cmd):
+        """
+        HELPER FUNCTION
+        Sends a query and converts the first field of the response to an int.
+        Args:
+            cmd (str): SCPI query to be sent.
+
+        Returns:
+            (int): Integer response from the instrument.
+        """
+
+        return int(self.query(cmd).partition(",")[0])
+
+    def wfm_buffer(self, length, dtype):
+        """
+        HELPER FUNCTION
+        Returns a view of the reusable waveform buffer with the requested length and data type.
+        The buffer only grows (to the next power of two bytes) and stays allocated until
+        release_wfm_buffer(), close(), or disconnect() is called. The returned array is
+        overwritten by the next call, so copy it if it needs to outlive the current download.
+        Args:
+            length (int): Number of samples.
+            dtype (NumPy dtype): Integer data type expected by the signal generator.
+
+        Returns:
+            (NumPy array): Uninitialized array backed by the reusable buffer.
+        """
+
+        numBytes = length * np.dtype(dtype).itemsize
+        if self.wfmBuffer is None or self.wfmBuffer.size < numBytes:
+            self.wfmBuffer = np.empty(1 << max(numBytes - 1, 0).bit_length(), dtype=np.uint8)
+        return self.wfmBuffer[:numBytes].view(dtype)
+
+    def release_wfm_buffer(self):
+        """Frees the reusable waveform buffer. It is allocated again by the next download."""
+
+        self.wfmBuffer = None
+
+    def close(self):
+        """Releases the reusable waveform buffer and closes the connection to the instrument."""
+
+        self.release_wfm_buffer()
+        return self.instance.close()
+
+    def disconnect(self):
+        """Releases the reusable waveform buffer and disconnects from the instrument."""
+
+        self.release_wfm_buffer()
+        return self.instance.disconnect()
+
+    def next_segment(self, ch):
+        """
+        HELPER FUNCTION
+        Returns the next free waveform segment number for an AWG channel.
+        The segment catalog is only queried the first time a channel is used and after the
+        cache is cleared, after that download_wfm() counts the segment number up locally.
+        The cache is cleared when a download raises an exception or when err_check() finds
+        an error. Segments created or deleted outside of this class (direct write() calls,
+        another client, etc.) aren't tracked, call clear_segment_cache() afterward so the
+        catalog is read again.
+        Args:
+            ch (int): AWG channel.
+
+        Returns:
+            (int): Segment number to use for the next waveform.
+        """
+
+        if ch not in self.nextSegment.keys():
+            self.nextSegment[ch] = int(self.query(f"trace{ch}:catalog?").strip().split(",")[-2]) + 1
+        return self.nextSegment[ch]
+
+    def clear_segment_cache(self, ch=None):
+        """
+        Forgets the locally tracked segment numbers so the next download reads the segment catalog again.
+        Call this after creating or deleting segments outside of this class.
+        Args:
+            ch (int): AWG channel to clear. Clears all channels if None.
+        """
+
+        if ch is None:
+            self.nextSegment.clear()
+        else:
+            self.nextSegment.pop(ch, None)
+
 class M8190A(SignalGeneratorBase):
     """Generic class for controlling a Keysight M8190A AWG.
 
@@ -144,6 +324,20 @@ class M8190A(SignalGeneratorBase):
         Add check to ensure that the correct instrument is connected
     """
 
+    # Waveform format constants (gran, minLen, binMult, binShift) for each DAC resolution
+    # See pages 273-274 in Keysight M8190A User's Guide (Edition 13.0, October 2017) for more info.
+    resolutionFormats = {
+        # 'wpr' = Performance (14 bit)
+        "wpr": (48, 240, 8191, 2),
+        # 'wsp' = Speed (12 bits)
+        "wsp": (64, 320, 2047, 4),
+        # 'intxX' = Digital Upconverter (DUC) (also 14 bits)
+        # Granularity, min length, and binary format are the same for all interpolated modes.
+        "intx": (24, 120, 16383, 1),
+    }
+    # Idle segment granularity for each DUC interpolation factor
+    idleGranularity = {3: 8, 12: 2, 24: 1, 48: 1}
+
     def __init__(self, ipAddress, apiType="socketscpi", timeout=10, reset=False, **kwargs):
         super().__init__(ipAddress, apiType=apiType, timeout=timeout, **kwargs)
         if reset:
@@ -151,31 +345,53 @@ class M8190A(SignalGeneratorBase):
             self.query("*opc?")
             self.write("abort")
         
-        # Query all settings from AWG and store them as class attributes
-        self.res = self.query("trace1:dwidth?").strip().lower()
-        self.func1 = self.query("func1:mode?").strip()
-        self.func2 = self.query("func2:mode?").strip()
-        self.clkSrc = self.query("frequency:raster:source?").strip().lower()
-        self.fs = float(self.query("frequency:raster?").strip())
-        self.bbfs = self.fs
-        self.refSrc = self.query("roscillator:source?").strip()
-        self.refFreq = float(self.query("roscillator:frequency?").strip())
-        self.out1 = self.query("output1:route?").strip()
-        self.out2 = self.query("output2:route?").strip()
-        self.func1 = self.query("func1:mode?").strip()
-        self.func2 = self.query("func2:mode?").strip()
-        self.cf1 = float(self.query("carrier1:freq?").strip().split(",")[0])
-        self.cf2 = float(self.query("carrier2:freq?").strip().split(",")[0])
-        self.amp1 = self.query(f"{self.out1}1:voltage:amplitude?")
-        self.amp2 = self.query(f"{self.out2}1:voltage:amplitude?")
-
-        # Initialize waveform format constants and populate them with check_resolution()
+        # Initialize waveform format constants, they are populated with check_resolution() in read_settings()
         self.gran = 0
         self.minLen = 0
         self.binMult = 0
         self.binShift = 0
         self.intFactor = 1
         self.idleGran = 0
+
+        # Query all settings from AWG and store them as class attributes
+        self.read_settings()
+
+    def read_settings(self):
+        """
+        HELPER FUNCTION
+        Queries all settings from the AWG using compound queries and stores them as class attributes.
+        """
+
+        (res, self.func1, self.func2, clkSrc, fsInt, fsExt, self.refSrc, refFreq, self.out1, self.out2, cf1, cf2) = self.query_multiple(
+            [
+                "trace1:dwidth?",
+                "func1:mode?",
+                "func2:mode?",
+                "frequency:raster:source?",
+                "frequency:raster?",
+                "frequency:raster:external?",
+                "roscillator:source?",
+                "roscillator:frequency?",
+                "output1:route?",
+                "output2:route?",
+                "carrier1:freq?",
+                "carrier2:freq?",
+            ]
+        )
+        self.res = res.lower()
+        self.clkSrc = clkSrc.lower()
+        # Sample rate is read from the internal or external clock depending on the clock source
+        if "int" in self.clkSrc:
+            self.fs = float(fsInt)
+        else:
+            self.fs = float(fsExt)
+        self.refFreq = float(refFreq)
+        self.cf1 = float(cf1.split(",")[0])
+        self.cf2 = float(cf2.split(",")[0])
+
+        # Amplitude commands depend on the output path, so they can only be queried once the output paths are known
+        self.amp1, self.amp2 = self.query_multiple([f"{self.out1}1:voltage:amplitude?", f"{self.out2}2:voltage:amplitude?"])
+
         self.check_resolution()
 
     def sanity_check(self):
@@ -215,54 +431,64 @@ class M8190A(SignalGeneratorBase):
         self.write("abort")
 
         # Check to see which keyword arguments the user sent and call the appropriate function
+        # Readback is skipped here so the commands go out back-to-back without waiting on a query for each one
         for key, value in kwargs.items():
             if key == "res":
-                self.set_resolution(value)
+                self.set_resolution(value, readback=False)
             elif key == "clkSrc":
-                self.set_clkSrc(value)
+                self.set_clkSrc(value, readback=False)
             elif key == "fs":
-                self.set_fs(value)
+                self.set_fs(value, readback=False)
             elif key == "refSrc":
-                self.set_refSrc(value)
+                self.set_refSrc(value, readback=False)
             elif key == "refFreq":
-                self.set_refFreq(value)
+                self.set_refFreq(value, readback=False)
             elif key == "out1":
-                self.set_output(1, value)
+                self.set_output(1, value, readback=False)
             elif key == "out2":
-                self.set_output(2, value)
+                self.set_output(2, value, readback=False)
             elif key == "amp1":
-                self.set_amp(1, value)
+                self.set_amp(1, value, readback=False)
             elif key == "amp2":
-                self.set_amp(2, value)
+                self.set_amp(2, value, readback=False)
             elif key == "func1":
-                self.set_func(1, value)
+                self.set_func(1, value, readback=False)
             elif key == "func2":
-                self.set_func(2, value)
+                self.set_func(2, value, readback=False)
             elif key == "cf1":
-                self.set_cf(1, value)
+                self.set_cf(1, value, readback=False)
             elif key == "cf2":
-                self.set_cf(2, value)
+                self.set_cf(2, value, readback=False)
             else:
                 raise KeyError(f'Invalid keyword argument: "{key}"')
+
+        # Wait for all the settings to be applied, then read them all back at once
+        self.query("*opc?")
+        self.read_settings()
         self.err_check()
 
-    def set_clkSrc(self, clkSrc):
+    def set_clkSrc(self, clkSrc, readback=True):
         """
         Sets and reads clock source parameter using SCPI commands.
         Args:
             clkSrc (str): Sample clock source ('int', 'ext')
+            readback (bool): Query the new value from the instrument. Skip this when sending several settings at once.
         """
 
         if clkSrc.lower() not in ["int", "ext"]:
             raise ValueError("'clkSrc' argument must be 'int' or 'ext'.")
         self.write(f"frequency:raster:source {clkSrc}")
-        self.clkSrc = self.query("frequency:raster:source?").strip().lower()
+        if readback:
+            self.clkSrc = self.query("frequency:raster:source?").strip().lower()
+        else:
+            self.clkSrc = clkSrc.lower()
 
-    def set_fs(self, fs):
+    def set_fs(self, fs, readback=True):
         """
         Sets and reads sample clock rate using SCPI commands.
         Args:
             fs (float): Sample clock rate.
+            readback (bool): Query the new value from the instrument. Skip this when sending several settings at once.
         """
 
         if not isinstance(fs, (int, float)) or fs <= 0:
@@ -270,19 +496,22 @@ class M8190A(SignalGeneratorBase):
 
         if "int" in self.clkSrc:
             self.write(f"frequency:raster {fs}")
-            self.fs = float(self.query("frequency:raster?").strip())
+            if readback:
+                self.fs = self.query_float("frequency:raster?")
         else:
             self.write(f"frequency:raster:external {fs}")
-            self.fs = float(self.query("frequency:raster:external?").strip())
+            if readback:
+                self.fs = self.query_float("frequency:raster:external?")
 
         self.bbfs = self.fs / self.intFactor
 
-    def set_output(self, ch, out):
+    def set_output(self, ch, out, readback=True):
         """
         Sets and reads output signal path for a given channel using SCPI commands.
         Args:
             ch (int): Channel to be configured
             out (str): Output path for channel ('dac', 'dc', 'ac')
+            readback (bool): Query the new value from the instrument. Skip this when sending several settings at once.
         """
 
         if out.lower() not in ["dac", "dc", "ac"]:
@@ -290,17 +519,21 @@ class M8190A(SignalGeneratorBase):
         if not isinstance(ch, int) or ch < 1 or ch > 2:
             raise ValueError("'ch' must be 1 or 2.")
         self.write(f"output{ch}:route {out}")
+        # The amplitude commands use the output path, so keep track of it even without readback
+        if readback:
+            out = self.query(f"output{ch}:route?").strip()
         if ch == 1:
-            self.out1 = self.query(f"output{ch}:route?").strip()
+            self.out1 = out
         else:
-            self.out2 = self.query(f"output{ch}:route?").strip()
+            self.out2 = out
 
-    def set_amp(self, ch, amp):
+    def set_amp(self, ch, amp, readback=True):
         """
         Sets and reads amplitude (peak to peak value) of a given AWG channel using SCPI commands.
         Args:
             ch (int): Channel to be configured.
             amp (float): Output amplitude for channel
+            readback (bool): Query the new value from the instrument. Skip this when sending several settings at once.
         """
 
         if not isinstance(amp, float) or amp <= 0:
@@ -310,17 +543,20 @@ class M8190A(SignalGeneratorBase):
 
         if ch == 1:
             self.write(f"{self.out1}1:voltage:amplitude {amp}")
-            self.amp1 = self.query(f"{self.out1}1:voltage:amplitude?")
+            if readback:
+                self.amp1 = self.query(f"{self.out1}1:voltage:amplitude?")
         else:
             self.write(f"{self.out2}2:voltage:amplitude {amp}")
-            self.amp2 = self.query(f"{self.out2}2:voltage:amplitude?")
+            if readback:
+                self.amp2 = self.query(f"{self.out2}2:voltage:amplitude?")
 
-    def set_func(self, ch, func):
+    def set_func(self, ch, func, readback=True):
         """
         Sets and reads function (arb/sequence) of given AWG channel using SCPI commands.
         Args:
             ch (int): Channel to be configured
             func (str): AWG function for channel ('arb', 'sts', 'stsc')
+            readback (bool): Query the new value from the instrument. Skip this when sending several settings at once.
         """
 
         if not isinstance(ch, int) or ch < 1 or ch > 2:
@@ -329,17 +565,20 @@ class M8190A(SignalGeneratorBase):
             raise ValueError("'func' must be 'arb', 'sts' (sequence), or 'stsc' (scenario).")
 
         self.write(f"func{ch}:mode {func}")
+        if not readback:
+            return
         if ch == 1:
             self.func1 = self.query(f"func{ch}:mode?").strip()
         else:
             self.func2 = self.query(f"func{ch}:mode?").strip()
 
-    def set_cf(self, ch, cf):
+    def set_cf(self, ch, cf, readback=True):
         """
         Sets and reads center frequency of a given channel using SCPI commands.
         Args:
             ch (int): Channel to be configured
             cf (float): Carrier frequency of channel
+            readback (bool): Query the new value from the instrument. Skip this when sending several settings at once.
         """
 
         if not isinstance(ch, int) or ch < 1 or ch > 2:
@@ -347,92 +586,87 @@ class M8190A(SignalGeneratorBase):
         if not isinstance(cf, float) or cf <= 0:
             raise ValueError("Carrier frequency must be a positive floating point value.")
         self.write(f"carrier{ch}:freq {cf}")
+        if not readback:
+            return
         if ch == 1:
-            self.cf1 = float(self.query(f"carrier{ch}:freq?").strip().split(",")[0])
+            self.cf1 = self.query_float(f"carrier{ch}:freq?")
         else:
-            self.cf2 = float(self.query(f"carrier{ch}:freq?").strip().split(",")[0])
+            self.cf2 = self.query_float(f"carrier{ch}:freq?")
 
-    def set_refSrc(self, refSrc):
+    def set_refSrc(self, refSrc, readback=True):
         """
         Sets and reads reference clock source using SCPI commands.
         Args:
             refSrc (str): Reference clock source ('axi', 'int', 'ext').
+            readback (bool): Query the new value from the instrument. Skip this when sending several settings at once.
         """
 
         if refSrc.lower() not in ["axi", "int", "ext"]:
             raise ValueError("'refSrc' argument must be 'axi', 'int', or 'ext'.")
 
         self.write(f"roscillator:source {refSrc}")
-        self.refSrc = self.query("roscillator:source?").strip()
+        if readback:
+            self.refSrc = self.query("roscillator:source?").strip()
 
-    def set_refFreq(self, refFreq):
+    def set_refFreq(self, refFreq, readback=True):
         """
         Sets and reads reference frequency using SCPI commands.
         Args:
             refFreq (float): Reference clock frequency
+            readback (bool): Query the new value from the instrument. Skip this when sending several settings at once.
         """
 
         if not isinstance(refFreq, float) or refFreq <= 0:
             raise ValueError("Reference frequency must be a positive floating point value.")
 
         self.write(f"roscillator:frequency {refFreq}")
-        self.refFreq = float(self.query("roscillator:frequency?").strip())
+        if readback:
+            self.refFreq = self.query_float("roscillator:frequency?")
 
-    def set_resolution(self, res="wsp"):
+    def set_resolution(self, res="wsp", readback=True):
         """
         Sets and reads resolution based on user input using SCPI commands.
         Args:
             res (str): DAC resolution of AWG ('wsp', 'wpr', 'intx3', 'intx12', 'intx24', 'intx48')
+            readback (bool): Query the new value from the instrument. Skip this when sending several settings at once.
         """
 
         if res.lower() not in ["wsp", "wpr", "intx3", "intx12", "intx24", "intx48"]:
             raise ValueError("res must be 'wsp', 'wpr', 'intx3', 'intx12', 'intx24', or 'intx48'.")
 
         self.write(f"trace1:dwidth {res}")
-        self.res = self.query("trace1:dwidth?").strip().lower()
+        if readback:
+            self.res = self.query("trace1:dwidth?").strip().lower()
+        else:
+            self.res = res.lower()
         self.check_resolution()
 
     def check_resolution(self):
         """
         HELPER FUNCTION
         Populates waveform formatting constants based on 'res' (DAC resolution) attribute.
+        Called whenever 'res' changes, so check_wfm() can use the constants directly.
         """
 
-        # 'wpr' = Performance (14 bit)
-        if self.res == "wpr":
-            self.gran = 48
-            self.minLen = 240
-            self.binMult = 8191
-            self.binShift = 2
-        # 'wsp' = Speed (12 bits)
-        elif self.res == "wsp":
-            self.gran = 64
-            self.minLen = 320
-            self.binMult = 2047
-            self.binShift = 4
-        # 'intxX' = Digital Upconverter (DUC) (also 14 bits)
-        elif "intx" in self.res:
-            # Granularity, min length, and binary format are the same for all interpolated modes.
-            self.gran = 24
-            self.minLen = 120
-            self.binMult = 16383
-            self.binShift = 1
-            self.intFactor = int(self.res.split("x")[-1])
-            # THIS IS IMPORTANT. If using the DUC, 'bbfs' should be used rather than 'fs' when creating waveforms.
-            self.bbfs = self.fs / self.intFactor
-            if self.intFactor == 3:
-                self.idleGran = 8
-            elif self.intFactor == 12:
-                self.idleGran = 2
-            elif self.intFactor == 24 or self.intFactor == 48:
-                self.idleGran = 1
+        if self.res in ["wpr", "wsp"]:
+            self.gran, self.minLen, self.binMult, self.binShift = self.resolutionFormats[self.res]
+            self.intFactor = 1
+        elif self.res in ["intx3", "intx12", "intx24", "intx48"]:
+            self.gran, self.minLen, self.binMult, self.binShift = self.resolutionFormats["intx"]
+            self.intFactor = int(self.res[4:])
+            self.idleGran = self.idleGranularity[self.intFactor]
         else:
             raise ValueError("res argument must be 'wsp', 'wpr', 'intx3', 'intx12', 'intx24', or 'intx48'.")
 
+        # THIS IS IMPORTANT. If using the DUC, 'bbfs' should be used rather than 'fs' when creating waveforms.
+        self.bbfs = self.fs / self.intFactor
+
     def download_wfm(self, wfmData, ch=1, name="wfm", wfmFormat="iq", sampleMkr=0, sampleMkrLength=240, syncMkr=0, syncMkrLength=240):
         """
         Defines and downloads a waveform into the segment memory.
         Assigns a waveform name to the segment. Returns segment number.
+        Segment numbers are tracked locally. Call clear_segment_cache() after creating or
+        deleting segments outside of this class.
         Args:
             wfmData (NumPy array): Waveform samples (real or complex floating point values).
             ch (int): Channel to which waveform will be downloaded.
@@ -462,30 +696,25 @@ class M8190A(SignalGeneratorBase):
         self.query("*opc?")
         # IQ format is a little complex (hahaha)
         if wfmFormat.lower() == "iq":
-            if wfmData.dtype != np.complex:
+            if not np.iscomplexobj(wfmData):
                 raise TypeError("Invalid wfm type. IQ waveforms must be an array of complex values.")
             else:
-                i = self.check_wfm(np.real(wfmData))
-                q = self.check_wfm(np.imag(wfmData))
+                # Scale and interleave I and Q in a single pass
+                wfm = self.check_wfm(wfmData, reuseBuffer=True)
+                i = wfm[0::2]
+                q = wfm[1::2]
 
-                # Create a pulse in the sample marker waveform starting at the selected index
-                sampleMkrData = np.zeros(len(i), dtype=np.int16)
-                # Sync marker occupies the least significant bit of each sample of I
-                sampleMkrData[sampleMkr : sampleMkr + sampleMkrLength] = 1
-                i += sampleMkrData
+                # Sample marker occupies the least significant bit of each sample of I
+                i[sampleMkr : sampleMkr + sampleMkrLength] += 1
 
-                # Create a pulse in the sync marker waveform starting at the selected index
-                syncMkrData = np.zeros(len(q), dtype=np.int16)
                 # Sync marker occupies the least significant bit of each sample of Q
-                syncMkrData[syncMkr : syncMkr + syncMkrLength] = 1
-                q += syncMkrData
+                q[syncMkr : syncMkr + syncMkrLength] += 1
 
-                # Interleave the I and Q arrays and adjust the length to compensate
-                wfm = self.iq_wfm_combiner(i, q)
+                # Adjust the length to compensate for interleaving
                 length = len(wfm) / 2
         # Real format is straightforward
         elif wfmFormat.lower() == "real":
-            wfm = self.check_wfm(wfmData)
+            wfm = self.check_wfm(wfmData, reuseBuffer=True)
             length = len(wfm)
 
             # Create a pulse in the sample marker waveform starting at the selected index
@@ -505,10 +734,17 @@ class M8190A(SignalGeneratorBase):
             raise ValueError('Invalid wfmFormat chosen. Use "iq" or "real".')
 
         # Initialize waveform segment, populate it with data, and provide a name
-        segment = int(self.query(f"trace{ch}:catalog?").strip().split(",")[-2]) + 1
-        self.write(f"trace{ch}:def {segment}, {length}")
-        self.write_binary_values(f"trace{ch}:data {segment}, 0, ", wfm, datatype='h')
-        self.write(f'trace{ch}:name {segment},"{name}_{segment}"')
+        segment = self.next_segment(ch)
+        # Count up optimistically, err_check() and the except clause below drop the cache if something went wrong
+        self.nextSegment[ch] = segment + 1
+        try:
+            self.write(f"trace{ch}:def {segment}, {length}")
+            self.write_binary_values(f"trace{ch}:data {segment}, 0, ", wfm, datatype='h')
+            self.write(f'trace{ch}:name {segment},"{name}_{segment}"')
+        except Exception:
+            # The segment may not have been created, so read the catalog again next time
+            self.clear_segment_cache(ch)
+            raise
 
         # Use 'segment' as the waveform identifier for the .play() method.
         return segment
@@ -551,7 +787,7 @@ class M8190A(SignalGeneratorBase):
         iq[1::2] = q
         return iq
 
-    def check_wfm(self, wfm):
+    def check_wfm(self, wfm, reuseBuffer=False):
         """
         HELPER FUNCTION
         Checks minimum size and granularity and returns waveform with
@@ -559,16 +795,18 @@ class M8190A(SignalGeneratorBase):
 
         See pages 273-274 in Keysight M8190A User's Guide (Edition 13.0,
         October 2017) for more info.
+        Complex waveforms are returned with I and Q interleaved.
         Args:
             wfm (NumPy array): Unscaled/unformatted waveform data.
+            reuseBuffer (bool): Write into the reusable waveform buffer instead of a new array. The returned array is then a view
+                into a buffer shared by every download_wfm() and reuseBuffer=True call on this instance, so it is overwritten
+                by the next one. Copy it if it needs to be kept.
 
         Returns:
             (NumPy array): Waveform data that has been scaled and
                 formatted appropriately for download to AWG
         """
 
-        self.check_resolution()
-
         # If waveform length doesn't meet granularity or minimum length requirements, repeat the waveform until it does
         repeats = wraparound_calc(len(wfm), self.gran, self.minLen)
         wfm = np.tile(wfm, repeats)
@@ -579,8 +817,14 @@ class M8190A(SignalGeneratorBase):
         if rem != 0:
             raise error.GranularityError(f"Waveform must have a granularity of {self.gran}. Extra samples: {rem}")
 
+        # Complex samples are stored as real/imag pairs, so a float view is already in interleaved IQ order.
+        # The view keeps the precision of the samples, just like np.real() and np.imag() do
+        if np.iscomplexobj(wfm):
+            wfm = np.ascontiguousarray(wfm).view(wfm.real.dtype)
+
         # Apply the binary multiplier, cast to int16, and shift samples over if required
-        return np.array(self.binMult * wfm, dtype=np.int16) << self.binShift
+        out = self.wfm_buffer(len(wfm), np.int16) if reuseBuffer else None
+        return wfm_scaler(wfm, self.binMult, self.binShift, dtype=np.int16, out=out)
 
     def delete_segment(self, wfmID=1, ch=1):
         """
@@ -597,12 +841,14 @@ class M8190A(SignalGeneratorBase):
             raise error.InstrumentError("Channel must be 1 or 2.")
         self.write("abort")
         self.write(f"trace{ch}:delete {wfmID}")
+        self.clear_segment_cache(ch)
 
     def clear_all_wfm(self):
         """Clears all segments from segment memory."""
         self.write("abort")
         self.write("trace1:delete:all")
         self.write("trace2:delete:all")
+        self.clear_segment_cache()
 
     def play(self, wfmID=1, ch=1):
         """
@@ -847,17 +1093,8 @@ class M8195A(SignalGeneratorBase):
             self.write("abort")
 
         # Query all settings from AWG and store them as class attributes
-        self.dacMode = self.query("inst:dacm?").strip()
         self.memDiv = 1
-        self.fs = float(self.query("frequency:raster?").strip())
-        self.effFs = self.fs / self.memDiv
-        self.func = self.query("func:mode?").strip()
-        self.refSrc = self.query("roscillator:source?").strip()
-        self.refFreq = float(self.query("roscillator:frequency?").strip())
-        self.amp1 = float(self.query("voltage1?"))
-        self.amp2 = float(self.query("voltage2?"))
-        self.amp3 = float(self.query("voltage3?"))
-        self.amp4 = float(self.query("voltage4?"))
+        self.read_settings()
 
         # Initialize waveform format constants and populate them with check_resolution()
         self.gran = 256
@@ -865,6 +1102,33 @@ class M8195A(SignalGeneratorBase):
         self.binMult = 127
         self.binShift = 0
 
+    def read_settings(self):
+        """
+        HELPER FUNCTION
+        Queries all settings from the AWG using a single compound query and stores them as class attributes.
+        """
+
+        (self.dacMode, fs, self.func, self.refSrc, refFreq, amp1, amp2, amp3, amp4) = self.query_multiple(
+            [
+                "inst:dacm?",
+                "frequency:raster?",
+                "func:mode?",
+                "roscillator:source?",
+                "roscillator:frequency?",
+                "voltage1?",
+                "voltage2?",
+                "voltage3?",
+                "voltage4?",
+            ]
+        )
+        self.fs = float(fs)
+        self.effFs = self.fs / self.memDiv
+        self.refFreq = float(refFreq)
+        self.amp1 = float(amp1)
+        self.amp2 = float(amp2)
+        self.amp3 = float(amp3)
+        self.amp4 = float(amp4)
+
     # def configure(self, dacMode='single', memDiv=1, fs=64e9, refSrc='axi', refFreq=100e6, amp1=300e-3, amp2=300e-3, amp3=300e-3, amp4=300e-3, func='arb'):
     def configure(self, **kwargs):
         """
@@ -884,112 +1148,132 @@ class M8195A(SignalGeneratorBase):
             self.stop(ch=ch)
 
         # Check to see which keyword arguments the user sent and call the appropriate function
+        # Readback is skipped here so the commands go out back-to-back without waiting on a query for each one
         for key, value in kwargs.items():
             if key == "dacMode":
-                self.set_dacMode(value)
+                self.set_dacMode(value, readback=False)
             elif key == "memDiv":
-                self.set_memDiv(value)
+                self.set_memDiv(value, readback=False)
             elif key == "fs":
-                self.set_fs(value)
+                self.set_fs(value, readback=False)
             elif key == "refSrc":
-                self.set_refSrc(value)
+                self.set_refSrc(value, readback=False)
             elif key == "refFreq":
-                self.set_refFreq(value)
+                self.set_refFreq(value, readback=False)
             elif key == "amp1":
-                self.set_amplitude(value, channel=1)
+                self.set_amplitude(value, channel=1, readback=False)
             elif key == "amp2":
-                self.set_amplitude(value, channel=2)
+                self.set_amplitude(value, channel=2, readback=False)
             elif key == "amp3":
-                self.set_amplitude(value, channel=3)
+                self.set_amplitude(value, channel=3, readback=False)
             elif key == "amp4":
-                self.set_amplitude(value, channel=4)
+                self.set_amplitude(value, channel=4, readback=False)
             elif key == "func":
-                self.set_func(value)
+                self.set_func(value, readback=False)
             else:
                 raise KeyError(f'Invalid keyword argument: "{key}"')  # raise KeyError('Invalid keyword argument. Use "dacMode", "memDiv", "fs", "refSrc", "refFreq", "amp1/2/3/4", or "func".')
 
+        # Wait for all the settings to be applied, then read them all back at once
+        self.query("*opc?")
+        self.read_settings()
         self.err_check()
 
-    def set_dacMode(self, dacMode="single"):
+    def set_dacMode(self, dacMode="single", readback=True):
         """
         Sets and reads DAC mode for the M8195A using SCPI commands.
         Args:
             dacMode (str): DAC operation mode. ('single', 'dual', 'four', 'marker', 'dcd', 'dcmarker')
+            readback (bool): Query the new value from the instrument. Skip this when sending several settings at once.
         """
 
         if dacMode not in ["single", "dual", "four", "marker", "dcd", "dcmarker"]:
             raise ValueError("'dacMode' must be 'single', 'dual', 'four', 'marker', 'dcd', or 'dcmarker'.")
 
         self.write(f"inst:dacm {dacMode}")
-        self.dacMode = self.query("inst:dacm?").strip().lower()
+        if readback:
+            self.dacMode = self.query("inst:dacm?").strip().lower()
 
-    def set_memDiv(self, memDiv=1):
+    def set_memDiv(self, memDiv=1, readback=True):
         """
         Sets and reads memory divider rate using SCPI commands.
         Args:
             memDiv (int): Clock/memory divider rate. (1, 2, 4)
+            readback (bool): Query the new value from the instrument. Skip this when sending several settings at once.
         """
 
         if memDiv not in [1, 2, 4]:
             raise ValueError("Memory divider must be 1, 2, or 4.")
         self.write(f"instrument:memory:extended:rdivider div{memDiv}")
-        self.memDiv = int(self.query("instrument:memory:extended:rdivider?").strip().split("DIV")[-1])
+        # The effective sample rate depends on the memory divider, so keep track of it even without readback
+        if readback:
+            self.memDiv = int(self.query("instrument:memory:extended:rdivider?").strip().split("DIV")[-1])
+        else:
+            self.memDiv = memDiv
 
-    def set_fs(self, fs=65e9):
+    def set_fs(self, fs=65e9, readback=True):
         """
         Sets and reads sample rate using SCPI commands.
         Args:
             fs (float): AWG sample rate.
+            readback (bool): Query the new value from the instrument. Skip this when sending several settings at once.
         """
 
         if not isinstance(fs, (int, float)) or fs <= 0:
             raise ValueError("Sample rate must be a positive floating point value.")
         self.write(f"frequency:raster {fs}")
-        self.fs = float(self.query("frequency:raster?").strip())
-        self.effFs = self.fs / self.memDiv
+        if readback:
+            self.fs = self.query_float("frequency:raster?")
+            self.effFs = self.fs / self.memDiv
 
-    def set_func(self, func="arb"):
+    def set_func(self, func="arb", readback=True):
         """
         Sets and reads AWG function using SCPI commands.
         Args:
             func (str): AWG mode, either arb or sequencing. ('arb', 'sts', 'stsc')
+            readback (bool): Query the new value from the instrument. Skip this when sending several settings at once.
         """
 
         if func.lower() not in ["arb", "sts", "stsc"]:
             raise ValueError("'func' argument must be 'arb', 'sts', 'stsc'")
         self.write(f"func:mode {func}")
-        self.func = self.query("func:mode?").strip()
+        if readback:
+            self.func = self.query("func:mode?").strip()
 
-    def set_refSrc(self, refSrc="axi"):
+    def set_refSrc(self, refSrc="axi", readback=True):
         """
         Sets and reads reference source using SCPI commands.
         Args:
             refSrc (str): Reference clock source. ('axi', 'int', 'ext')
+            readback (bool): Query the new value from the instrument. Skip this when sending several settings at once.
         """
 
         if refSrc.lower() not in ["axi", "int", "ext"]:
             raise ValueError("'refSrc' must be 'axi', 'int', or 'ext'")
         self.write(f"roscillator:source {refSrc}")
-        self.refSrc = self.query("roscillator:source?").strip()
+        if readback:
+            self.refSrc = self.query("roscillator:source?").strip()
 
-    def set_refFreq(self, refFreq=100e6):
+    def set_refFreq(self, refFreq=100e6, readback=True):
         """
         Sets and reads reference frequency using SCPI commands.
         Args:
             refFreq (float): Reference clock frequency.
+            readback (bool): Query the new value from the instrument. Skip this when sending several settings at once.
         """
 
         if not isinstance(refFreq, float) or refFreq <= 0:
             raise ValueError("Reference frequency must be a positive floating point value.")
         self.write(f"roscillator:frequency {refFreq}")
-        self.refFreq = float(self.query("roscillator:frequency?").strip())
+        if readback:
+            self.refFreq = self.query_float("roscillator:frequency?")
 
-    def set_amplitude(self, amplitude=300e-3, channel=1):
+    def set_amplitude(self, amplitude=300e-3, channel=1, readback=True):
         """
         Sets and reads the output voltage amplitude (pk-pk) for specified channels using SCPI commands.
         Args:
             amplitude (float): Output amplitude in Volts pk-pk.
             channel (int): Channel to change. (1, 2, 3, or 4).
+            readback (bool): Query the new value from the instrument. Skip this when sending several settings at once.
         """
         if channel not in [1, 2, 3, 4]:
             raise error.InstrumentError("'channel' must be 1, 2, 3, or 4.")
@@ -999,9 +1283,11 @@ class M8195A(SignalGeneratorBase):
             raise error.InstrumentError("'amplitude' must be between 75 mV and 1 V.")
 
         self.write(f"voltage{channel} {amplitude}")
+        if not readback:
+            return
         # This is a neat use of Python's exec() function, which takes a "program" in as a string and executes it
         # Very useful if you need to dynamically decide which variable names to call
-        exec(f"self.amp{channel} = float(self.query('voltage{channel}?'))")
+        exec(f"self.amp{channel} = self.query_float('voltage{channel}?')")
 
     def sanity_check(self):
         """Prints out user-accessible class attributes."""
@@ -1020,6 +1306,8 @@ class M8195A(SignalGeneratorBase):
         """
         Defines and downloads a waveform into the segment memory.
         Assigns a waveform name to the segment. Returns segment number.
+        Segment numbers are tracked locally. Call clear_segment_cache() after creating or
+        deleting segments outside of this class.
         Args:
             wfmData (NumPy array): Waveform samples (real or complex floating point values).
             ch (int): Channel to which waveform will be downloaded.
@@ -1033,19 +1321,26 @@ class M8195A(SignalGeneratorBase):
 
         # Stop output before doing anything else
         self.write("abort")
-        wfm = self.check_wfm(wfmData)
+        wfm = self.check_wfm(wfmData, reuseBuffer=True)
         length = len(wfmData)
 
         # Initialize waveform segment, populate it with data, and provide a name
-        segment = int(self.query(f"trace{ch}:catalog?").strip().split(",")[-2]) + 1
-        self.write(f"trace{ch}:def {segment}, {length}")
-        self.write_binary_values(f"trace{ch}:data {segment}, 0, ", wfm, datatype='b')
-        self.write(f'trace{ch}:name {segment},"{name}_{segment}"')
+        segment = self.next_segment(ch)
+        # Count up optimistically, err_check() and the except clause below drop the cache if something went wrong
+        self.nextSegment[ch] = segment + 1
+        try:
+            self.write(f"trace{ch}:def {segment}, {length}")
+            self.write_binary_values(f"trace{ch}:data {segment}, 0, ", wfm, datatype='b')
+            self.write(f'trace{ch}:name {segment},"{name}_{segment}"')
+        except Exception:
+            # The segment may not have been created, so read the catalog again next time
+            self.clear_segment_cache(ch)
+            raise
 
         # Use 'segment' as the waveform identifier for the .play() method.
         return segment
 
-    def check_wfm(self, wfmData):
+    def check_wfm(self, wfmData, reuseBuffer=False):
         """
         HELPER FUNCTION
         Checks minimum size and granularity and returns waveform with
@@ -1055,6 +1350,9 @@ class M8195A(SignalGeneratorBase):
         March 2019) for more info.
         Args:
             wfmData (NumPy array): Unscaled/unformatted waveform data.
+            reuseBuffer (bool): Write into the reusable waveform buffer instead of a new array. The returned array is then a view
+                into a buffer shared by every download_wfm() and reuseBuffer=True call on this instance, so it is overwritten
+                by the next one. Copy it if it needs to be kept.
 
         Returns:
             (NumPy array): Waveform data that has been scaled and
@@ -1070,8 +1368,9 @@ class M8195A(SignalGeneratorBase):
         if rl % self.gran != 0:
             raise error.GranularityError(f"Waveform must have a granularity of {self.gran}.")
 
-        # Apply the binary multiplier, cast to int16, and shift samples over if required
-        return np.array(self.binMult * wfm, dtype=np.int8) << self.binShift
+        # Apply the binary multiplier, cast to int8, and shift samples over if required
+        out = self.wfm_buffer(len(wfm), np.int8) if reuseBuffer else None
+        return wfm_scaler(wfm, self.binMult, self.binShift, dtype=np.int8, out=out)
 
     def delete_segment(self, wfmID=1, ch=1):
         """
@@ -1088,12 +1387,14 @@ class M8195A(SignalGeneratorBase):
             raise ValueError("Channel must be 1, 2, 3, or 4.")
         self.write("abort")
         self.write(f"trace{ch}:del {wfmID}")
+        self.clear_segment_cache(ch)
 
     def clear_all_wfm(self):
         """Clears all segments from segment memory."""
         self.write("abort")
         for ch in range(1, 5):
             self.write(f"trace{ch}:del:all")
+        self.clear_segment_cache()
 
     def play(self, wfmID=1, ch=1):
         """
@@ -1144,10 +1445,10 @@ class M8196A(SignalGeneratorBase):
 
         # Query all settings from AWG and store them as class attributes
         self.dacMode = self.query("inst:dacm?").strip()
-        self.fs = float(self.query("frequency:raster?").strip())
-        self.amp = float(self.query("voltage?").strip())
+        self.fs = self.query_float("frequency:raster?")
+        self.amp = self.query_float("voltage?")
         self.refSrc = self.query("roscillator:source?").strip()
-        self.refFreq = float(self.query("roscillator:frequency?").strip())
+        self.refFreq = self.query_float("roscillator:frequency?")
 
         # Initialize waveform format constants and populate them with check_resolution()
         self.gran = 128
@@ -1208,7 +1509,7 @@ class M8196A(SignalGeneratorBase):
         if not isinstance(fs, (int, float)) or fs <= 0:
             raise ValueError("Sample rate must be a positive floating point value.")
         self.write(f"frequency:raster {fs}")
-        self.fs = float(self.query("frequency:raster?").strip())
+        self.fs = self.query_float("frequency:raster?")
 
     def set_refSrc(self, refSrc="axi"):
         """
@@ -1255,7 +1556,7 @@ class M8196A(SignalGeneratorBase):
             else:
                 raise error.InstrumentError("Selected reference clock frequency outside allowable range.")
             self.write(f"roscillator:frequency {refFreq}")
-        self.refFreq = float(self.query("roscillator:frequency?").strip())
+        self.refFreq = self.query_float("roscillator:frequency?")
 
     def sanity_check(self):
         """Prints out user-accessible class attributes."""
@@ -1283,7 +1584,7 @@ class M8196A(SignalGeneratorBase):
         # Stop output before doing anything else
         self.write("abort")
         self.clear_all_wfm()
-        wfm = self.check_wfm(wfmData)
+        wfm = self.check_wfm(wfmData, reuseBuffer=True)
         length = len(wfm)
 
         # Initialize waveform segment, populate it with data, and provide a name
@@ -1295,7 +1596,7 @@ class M8196A(SignalGeneratorBase):
         # Use 'segment' as the waveform identifier for the .play() method.
         return segment
 
-    def check_wfm(self, wfmData):
+    def check_wfm(self, wfmData, reuseBuffer=False):
         """
         HELPER FUNCTION
         Checks minimum size and granularity and returns waveform with
@@ -1305,6 +1606,9 @@ class M8196A(SignalGeneratorBase):
         March 2018) for more info.
         Args:
             wfmData (NumPy array): Unscaled/unformatted waveform data.
+            reuseBuffer (bool): Write into the reusable waveform buffer instead of a new array. The returned array is then a view
+                into a buffer shared by every download_wfm() and reuseBuffer=True call on this instance, so it is overwritten
+                by the next one. Copy it if it needs to be kept.
 
         Returns:
             (NumPy array): Waveform data that has been scaled and
@@ -1322,8 +1626,9 @@ class M8196A(SignalGeneratorBase):
         if rl % self.gran != 0:
             raise error.GranularityError(f"Waveform must have a granularity of {self.gran}.")
 
-        # Apply the binary multiplier, cast to int16, and shift samples over if required
-        return np.array(self.binMult * wfm, dtype=np.int8) << self.binShift
+        # Apply the binary multiplier, cast to int8, and shift samples over if required
+        out = self.wfm_buffer(len(wfm), np.int8) if reuseBuffer else None
+        return wfm_scaler(wfm, self.binMult, self.binShift, dtype=np.int8, out=out)
 
     def delete_segment(self):
         """Deletes waveform segment (M8196A only has one)."""
@@ -1334,6 +1639,7 @@ class M8196A(SignalGeneratorBase):
         self.write("abort")
         for ch in range(1, 5):
             self.write(f"trace{ch}:del:all")
+        self.clear_segment_cache()
 
     def play(self, ch=1):
         """
@@ -1384,35 +1690,61 @@ class VSG(SignalGeneratorBase):
             self.query("*opc?")
 
         # Query all settings from VSG and store them as class attributes
-        self.rfState = self.query("output?").strip()
-        self.modState = self.query("output:modulation?").strip()
-        self.cf = float(self.query("frequency?").strip())
-        self.amp = float(self.query("power?").strip())
-        self.alcState = self.query("power:alc?")
-        self.refSrc = self.query("roscillator:source?").strip()
-        self.arbState = self.query("radio:arb:state?").strip()
-        self.fs = float(self.query("radio:arb:sclock:rate?").strip())
+        self.read_settings()
+
+        # Initialize waveform format constants and populate them with check_resolution()
+        self.minLen = 60
+        self.binMult = 32767
+        if "M938" not in self.instId:
+            self.gran = 2
+        else:
+            self.gran = 4
+
+    def read_settings(self):
+        """
+        HELPER FUNCTION
+        Queries all settings from the VSG using a single compound query and stores them as class attributes.
+        """
+
+        cmds = [
+            "output?",
+            "output:modulation?",
+            "frequency?",
+            "power?",
+            "power:alc?",
+            "roscillator:source?",
+            "radio:arb:state?",
+            "radio:arb:sclock:rate?",
+        ]
+        # M9381/3A don't have an IQ scaling command.
+        if "M938" not in self.instId:
+            cmds.append("radio:arb:rscaling?")
+        settings = self.query_multiple(cmds)
+
+        (rfState, modState, cf, amp, alcState, self.refSrc, arbState, fs) = settings[:8]
+        self.rfState = int(rfState)
+        self.modState = int(modState)
+        self.alcState = int(alcState)
+        self.arbState = int(arbState)
+        self.cf = float(cf)
+        self.amp = float(amp)
+        self.fs = float(fs)
+        if "M938" not in self.instId:
+            self.iqScale = float(settings[8])
+
+        # Reference frequency query depends on the reference source
         if "int" in self.refSrc.lower():
             self.refFreq = 10e6
         elif "ext" in self.refSrc.lower():
-            self.refFreq = float(self.query("roscillator:frequency:external?").strip())
+            self.refFreq = self.query_float("roscillator:frequency:external?")
         elif "bbg" in self.refSrc.lower():
             if "M938" not in self.instId:
-                self.refFreq = float(self.query("roscillator:frequency:bbg?").strip())
+                self.refFreq = self.query_float("roscillator:frequency:bbg?")
             else:
                 raise error.InstrumentError("Invalid reference source chosen, select 'int' or 'ext'.")
         else:
             raise error.InstrumentError("Unknown refSrc selected.")
 
-        # Initialize waveform format constants and populate them with check_resolution()
-        self.minLen = 60
-        self.binMult = 32767
-        if "M938" not in self.instId:
-            self.iqScale = float(self.query("radio:arb:rscaling?").strip())
-            self.gran = 2
-        else:
-            self.gran = 4
-
     # def configure(self, rfState=1, modState=1, cf=1e9, amp=-20, alcState=0, iqScale=70, refSrc='int', fs=200e6):
     def configure(self, **kwargs):
         """
@@ -1429,23 +1761,24 @@ class VSG(SignalGeneratorBase):
         """
 
         # Check to see which keyword arguments the user sent and call the appropriate function
+        # Readback is skipped here so the commands go out back-to-back without waiting on a query for each one
         for key, value in kwargs.items():
             if key == "rfState":
-                self.set_rfState(value)
+                self.set_rfState(value, readback=False)
             elif key == "modState":
-                self.set_modState(value)
+                self.set_modState(value, readback=False)
             elif key == "cf":
-                self.set_cf(value)
+                self.set_cf(value, readback=False)
             elif key == "amp":
-                self.set_amp(value)
+                self.set_amp(value, readback=False)
             elif key == "alcState":
-                self.set_alcState(value)
+                self.set_alcState(value, readback=False)
             elif key == "iqScale":
-                self.set_iqScale(value)
+                self.set_iqScale(value, readback=False)
             elif key == "refSrc":
-                self.set_refSrc(value)
+                self.set_refSrc(value, readback=False)
             elif key == "fs":
-                self.set_fs(value)
+                self.set_fs(value, readback=False)
             else:
                 raise KeyError(f'Invalid keyword argument: "{key}"')  # raise KeyError('Invalid keyword argument.')
 
@@ -1453,33 +1786,40 @@ class VSG(SignalGeneratorBase):
         # self.write(f'radio:arb:state {arbState}')
         # self.arbState = self.query('radio:arb:state?').strip()
 
+        # Wait for all the settings to be applied, then read them all back at once
+        self.query("*opc?")
+        self.read_settings()
         self.err_check()
 
-    def set_rfState(self, rfState):
+    def set_rfState(self, rfState, readback=True):
         """
         Sets and reads the state of the RF output using SCPI commands.
         Args:
             rfState (int): Turns the RF output on or off. (1, 0)
+            readback (bool): Query the new value from the instrument. Skip this when sending several settings at once.
         """
 
         if rfState not in [1, 0, "on", "off", "ON", "OFF", "On", "Off"]:
             raise ValueError('"rfState" should be 1, 0, "on", or "off"')
 
         self.write(f"output {rfState}")
-        self.rfState = int(self.query("output?").strip())
+        if readback:
+            self.rfState = self.query_int("output?")
 
-    def set_modState(self, modState):
+    def set_modState(self, modState, readback=True):
         """
         Sets and reads the state of the internal baseband modulator output using SCPI commands.
         Args:
             modState (int): Turns the baseband modulator on or off. (1, 0)
+            readback (bool): Query the new value from the instrument. Skip this when sending several settings at once.
         """
 
         if modState not in [1, 0, "on", "off", "ON", "OFF", "On", "Off"]:
             raise ValueError('"modState" should be 1, 0, "on", or "off"')
 
         self.write(f"output:modulation {modState}")
-        self.modState = int(self.query("output:modulation?").strip())
+        if readback:
+            self.modState = self.query_int("output:modulation?")
 
     def set_arbState(self, arbState):
         """
@@ -1492,52 +1832,59 @@ class VSG(SignalGeneratorBase):
             raise ValueError('"arbState" should be 1, 0, "on", or "off"')
 
         self.write(f"radio:arb:state {arbState}")
-        self.arbState = int(self.query("radio:arb:state?").strip())
+        self.arbState = self.query_int("radio:arb:state?")
 
-    def set_cf(self, cf):
+    def set_cf(self, cf, readback=True):
         """
         Sets and reads the center frequency of the signal generator output using SCPI commands.
         Args:
             cf (float): Sets the generator's carrier frequency.
+            readback (bool): Query the new value from the instrument. Skip this when sending several settings at once.
         """
 
         if not isinstance(cf, float) or cf <= 0:
             raise ValueError("Carrier frequency must be a positive floating point value.")
         self.write(f"frequency {cf}")
-        self.cf = float(self.query("frequency?").strip())
+        if readback:
+            self.cf = self.query_float("frequency?")
 
-    def set_amp(self, amp):
+    def set_amp(self, amp, readback=True):
         """
         Sets and reads the output amplitude of signal generator output using SCPI commands.
         Args:
             amp (int/float): Sets the generator's RF output power.
+            readback (bool): Query the new value from the instrument. Skip this when sending several settings at once.
         """
 
         if not isinstance(amp, (float, int)):
             raise ValueError("Amp argument must be a numerical value.")
         self.write(f"power {amp}")
-        self.amp = float(self.query("power?").strip())
+        if readback:
+            self.amp = self.query_float("power?")
 
-    def set_alcState(self, alcState):
+    def set_alcState(self, alcState, readback=True):
         """
         Sets and reads the state of the ALC (automatic level control) output using SCPI commands.
         This should be turned off for narrow pulses and signals with rapid amplitude changes.
         Args:
             alcState (int): Turns the ALC (automatic level control) on or off. (1, 0)
+            readback (bool): Query the new value from the instrument. Skip this when sending several settings at once.
         """
 
         if alcState not in [1, 0, "on", "off", "ON", "OFF", "On", "Off"]:
             raise ValueError('"rfState" should be 1, 0, "on", or "off"')
 
         self.write(f"power:alc {alcState}")
-        self.alcState = int(self.query("power:alc?").strip())
+        if readback:
+            self.alcState = self.query_int("power:alc?")
 
-    def set_iqScale(self, iqScale):
+    def set_iqScale(self, iqScale, readback=True):
         """
         Sets and reads the scaling of the baseband IQ waveform output using SCPI commands.
         Should be about 70 percent to avoid clipping.
         Args:
             iqScale (int): Scales the IQ modulator in percent. Default/safe value is 70, range is 0 to 100.
+            readback (bool): Query the new value from the instrument. Skip this when sending several settings at once.
         """
 
         if not isinstance(iqScale, int) or iqScale <= 0 or iqScale > 100:
@@ -1546,25 +1893,29 @@ class VSG(SignalGeneratorBase):
         # M9381/3A don't have an IQ scaling command.
         if "M938" not in self.instId:
             self.write(f"radio:arb:rscaling {iqScale}")
-            self.iqScale = float(self.query("radio:arb:rscaling?").strip())
+            if readback:
+                self.iqScale = self.query_float("radio:arb:rscaling?")
 
-    def set_fs(self, fs):
+    def set_fs(self, fs, readback=True):
         """
         Sets and reads sample  rate of internal arb output using SCPI commands.
         Args:
             fs (float): Sample rate.
+            readback (bool): Query the new value from the instrument. Skip this when sending several settings at once.
         """
 
         if not isinstance(fs, (int, float)) or fs <= 0:
             raise ValueError("Sample rate must be a positive floating point value.")
         self.write(f"radio:arb:sclock:rate {fs}")
-        self.fs = float(self.query("radio:arb:sclock:rate?").strip())
+        if readback:
+            self.fs = self.query_float("radio:arb:sclock:rate?")
 
-    def set_refSrc(self, refSrc):
+    def set_refSrc(self, refSrc, readback=True):
         """
         Sets and reads the reference clock source output using SCPI commands.
         Args:
             refSrc (str): Sets the reference clock source. ('int', 'ext', 'bbg')
+            readback (bool): Query the new value from the instrument. Skip this when sending several settings at once.
         """
 
         if not isinstance(refSrc, str) or refSrc.lower() not in [
@@ -1577,13 +1928,15 @@ class VSG(SignalGeneratorBase):
             raise ValueError('"refSrc" must be "internal", "external", or "bbg".')
 
         self.write(f"roscillator:source {refSrc}")
+        if not readback:
+            return
         self.refSrc = self.query("roscillator:source?").strip()
         if "int" in self.refSrc.lower():
             self.refFreq = 10e6
         elif "ext" in self.refSrc.lower():
-            self.refFreq = float(self.query("roscillator:frequency:external?").strip())
+            self.refFreq = self.query_float("roscillator:frequency:external?")
         elif "bbg" in self.refSrc.lower():
-            self.refFreq = float(self.query("roscillator:frequency:bbg?").strip())
+            self.refFreq = self.query_float("roscillator:frequency:bbg?")
         else:
             raise error.InstrumentError("Unknown refSrc selected.")
 
@@ -1627,13 +1980,11 @@ class VSG(SignalGeneratorBase):
             raise TypeError("wfmData should be a complex NumPy array.")
 
         # Waveform format checking. VSGs can only use 'iq' format waveforms.
-        if wfmData.dtype != complex:
+        if not np.iscomplexobj(wfmData):
             raise TypeError("Invalid wfm type. IQ waveforms must be an array of complex values.")
         else:
-            i = self.check_wfm(np.real(wfmData), bigEndian=bigEndian)
-            q = self.check_wfm(np.imag(wfmData), bigEndian=bigEndian)
-
-            wfm = self.iq_wfm_combiner(i, q)
+            # Scale and interleave I and Q in a single pass
+            wfm = self.check_wfm(wfmData, bigEndian=bigEndian, reuseBuffer=True)
 
         # M9381/3A download procedure is slightly different from X-series sig gens
         if "M938" in self.instId:
@@ -1675,7 +2026,7 @@ class VSG(SignalGeneratorBase):
         iq[1::2] = q
         return iq
 
-    def check_wfm(self, wfm, bigEndian=True):
+    def check_wfm(self, wfm, bigEndian=True, reuseBuffer=False):
         """
         HELPER FUNCTION
         Checks minimum size and granularity and returns waveform with
@@ -1684,9 +2035,13 @@ class VSG(SignalGeneratorBase):
 
         See pages 205-256 in Keysight X-Series Signal Generators Programming
         Guide (November 2014 Edition) for more info.
+        Complex waveforms are returned with I and Q interleaved.
         Args:
             wfm (NumPy array): Unscaled/unformatted waveform data.
             bigEndian (bool): Determines whether waveform is big endian.
+            reuseBuffer (bool): Write into the reusable waveform buffer instead of a new array. The returned array is then a view
+                into a buffer shared by every download_wfm() and reuseBuffer=True call on this instance, so it is overwritten
+                by the next one. Copy it if it needs to be kept.
 
         Returns:
             (NumPy array): Waveform data that has been scaled and
@@ -1702,10 +2057,16 @@ class VSG(SignalGeneratorBase):
         if rl % self.gran != 0:
             raise error.GranularityError(f"Waveform must have a granularity of {self.gran}.")
 
+        # Complex samples are stored as real/imag pairs, so a float view is already in interleaved IQ order.
+        # The view keeps the precision of the samples, just like np.real() and np.imag() do
+        if np.iscomplexobj(wfm):
+            wfm = np.ascontiguousarray(wfm).view(wfm.real.dtype)
+
+        out = self.wfm_buffer(len(wfm), np.int16) if reuseBuffer else None
+        wfm = wfm_scaler(wfm, self.binMult, dtype=np.int16, out=out)
         if bigEndian:
-            return np.array(self.binMult * wfm, dtype=np.int16).byteswap()
-        else:
-            return np.array(self.binMult * wfm, dtype=np.int16)
+            wfm.byteswap(inplace=True)
+        return wfm
 
     def delete_wfm(self, wfmID):
         """
@@ -1791,26 +2152,26 @@ class VXG(SignalGeneratorBase):
         # Query all settings from VXG and store them as class attributes
         self.rfState1 = self.query("rf1:output?").strip()
         self.modState1 = self.query("rf1:output:modulation?").strip()
-        self.cf1 = float(self.query("source:rf1:frequency?").strip())
-        self.amp1 = float(self.query("rf1:power?").strip())
+        self.cf1 = self.query_float("source:rf1:frequency?")
+        self.amp1 = self.query_float("rf1:power?")
         self.arbState1 = self.query("signal1:state?").strip()
         self.alcState1 = self.query("rf1:power:alc?")
-        self.iqScale1 = float(self.query("source:signal1:waveform:scale?").strip())
-        self.rms1 = float(self.query("source:signal1:waveform:rms?").strip())
-        self.fs1 = float(self.query("signal1:waveform:sclock:rate?").strip())
+        self.iqScale1 = self.query_float("source:signal1:waveform:scale?")
+        self.rms1 = self.query_float("source:signal1:waveform:rms?")
+        self.fs1 = self.query_float("signal1:waveform:sclock:rate?")
 
         # If there are two channels, repeat the queries above for the second channel
         if "002" in optionString:
             self.numCh = 2
             self.rfState2 = self.query("rf2:output?").strip()
             self.modState2 = self.query("rf2:output:modulation?").strip()
-            self.cf2 = float(self.query("source:rf2:frequency?").strip())
-            self.amp2 = float(self.query("rf2:power?").strip())
+            self.cf2 = self.query_float("source:rf2:frequency?")
+            self.amp2 = self.query_float("rf2:power?")
             self.arbState2 = self.query("signal2:state?").strip()
             self.alcState2 = self.query("rf2:power:alc?")
-            self.iqScale2 = float(self.query("source:signal2:waveform:scale?").strip())
-            self.rms2 = float(self.query("source:signal2:waveform:rms?").strip())
-            self.fs2 = float(self.query("signal2:waveform:sclock:rate?").strip())
+            self.iqScale2 = self.query_float("source:signal2:waveform:scale?")
+            self.rms2 = self.query_float("source:signal2:waveform:rms?")
+            self.fs2 = self.query_float("signal2:waveform:sclock:rate?")
         else:
             self.numCh = 1
 
@@ -1820,7 +2181,7 @@ class VXG(SignalGeneratorBase):
         if "int" in self.refSrc.lower():
             self.refFreq = 10e6
         elif "ext" in self.refSrc.lower():
-            self.refFreq = float(self.query("roscillator:frequency:external?").strip())
+            self.refFreq = self.query_float("roscillator:frequency:external?")
         else:
             raise error.InstrumentError("Unknown refSrc selected.")
 
@@ -1920,7 +2281,7 @@ class VXG(SignalGeneratorBase):
             raise ValueError('"rfState" should be 1, 0, "on", or "off"')
 
         self.write(f"source:rf{ch}:output:state {rfState}")
-        exec(f'self.rfState{ch} = int(self.query(f"source:rf{ch}:output:state?").strip())')
+        exec(f'self.rfState{ch} = self.query_int(f"source:rf{ch}:output:state?")')
 
     def set_modState(self, modState, ch=1):
         """
@@ -1935,7 +2296,7 @@ class VXG(SignalGeneratorBase):
             raise ValueError('"modState" should be 1, 0, "on", or "off"')
 
         self.write(f"source:rf{ch}:output:modulation {modState}")
-        exec(f'self.modState{ch} = int(self.query(f"source:rf{ch}:output:modulation?").strip())')
+        exec(f'self.modState{ch} = self.query_int(f"source:rf{ch}:output:modulation?")')
 
     def set_arbState(self, arbState, ch=1):
         """
@@ -1950,7 +2311,7 @@ class VXG(SignalGeneratorBase):
             raise ValueError('"arbState" should be 1, 0, "on", or "off"')
 
         self.write(f"source:signal{ch}:state {arbState}")
-        exec(f'self.arbState{ch} = int(self.query(f"source:signal{ch}:state?").strip())')
+        exec(f'self.arbState{ch} = self.query_int(f"source:signal{ch}:state?")')
 
     def set_cf(self, cf, ch=1):
         """
@@ -1971,7 +2332,7 @@ class VXG(SignalGeneratorBase):
             raise ValueError("Carrier frequency must be a positive floating point value.")
 
         self.write(f"source:rf{ch}:frequency {cf}")
-        exec(f'self.cf = float(self.query(f"source:rf{ch}:frequency?").strip())')
+        exec(f'self.cf = self.query_float(f"source:rf{ch}:frequency?")')
 
     def set_amp(self, amp, ch=1):
         """
@@ -1991,7 +2352,7 @@ class VXG(SignalGeneratorBase):
             raise ValueError('"amp" should be a numerical value.')
 
         self.write(f"source:rf{ch}:power {amp}")
-        exec(f'self.amp{ch} = float(self.query(f"source:rf{ch}:power?").strip())')
+        exec(f'self.amp{ch} = self.query_float(f"source:rf{ch}:power?")')
 
     def set_alcState(self, alcState, ch=1):
         """
@@ -2007,7 +2368,7 @@ class VXG(SignalGeneratorBase):
             raise ValueError('"alcState" should be 1, 0, "on", or "off"')
 
         self.write(f"source:rf{ch}:power:alc {alcState}")
-        exec(f'self.alcState{ch} = int(self.query(f"source:rf{ch}:power:alc?").strip())')
+        exec(f'self.alcState{ch} = self.query_int(f"source:rf{ch}:power:alc?")')
 
     def set_iqScale(self, iqScale, ch=1):
         """
@@ -2029,7 +2390,7 @@ class VXG(SignalGeneratorBase):
             raise ValueError("iqScale argument must be an integer between 1 and 100.")
 
         self.write(f"source:signal{ch}:waveform:scale {iqScale}")
-        exec(f'self.iqScale{ch} = float(self.query(f"source:signal{ch}:waveform:scale?").strip())')
+        exec(f'self.iqScale{ch} = self.query_float(f"source:signal{ch}:waveform:scale?")')
 
     def set_rms(self, rms, ch=1):
         """
@@ -2052,7 +2413,7 @@ class VXG(SignalGeneratorBase):
             raise ValueError('"rms" must be a floating point value between 0.1 and 1.414213562.')
 
         self.write(f"source:signal{ch}:waveform:rms {rms}")
-        exec(f'self.rms{ch} = float(self.query(f"source:signal{ch}:waveform:rms?").strip())')
+        exec(f'self.rms{ch} = self.query_float(f"source:signal{ch}:waveform:rms?")')
 
     def set_fs(self, fs, ch=1):
         """
@@ -2074,7 +2435,7 @@ class VXG(SignalGeneratorBase):
             raise ValueError("Sample rate must be a positive floating point value.")
 
         self.write(f"signal{ch}:waveform:sclock:rate {fs}")
-        exec(f"self.fs{ch} = float(self.query('signal{ch}:waveform:sclock:rate?').strip())")
+        exec(f"self.fs{ch} = self.query_float('signal{ch}:waveform:sclock:rate?')")
 
     def set_refSrc(self, refSrc):
         """
@@ -2091,9 +2452,9 @@ class VXG(SignalGeneratorBase):
         if "int" in self.refSrc.lower():
             self.refFreq = 10e6
         elif "ext" in self.refSrc.lower():
-            self.refFreq = float(self.query("roscillator:frequency:external?").strip())
+            self.refFreq = self.query_float("roscillator:frequency:external?")
         elif "bbg" in self.refSrc.lower():
-            self.refFreq = float(self.query("roscillator:frequency:bbg?").strip())
+            self.refFreq = self.query_float("roscillator:frequency:bbg?")
         else:
             raise error.InstrumentError("Unknown refSrc selected.")
 
@@ -2142,13 +2503,11 @@ class VXG(SignalGeneratorBase):
         if not isinstance(wfmData, np.ndarray):
             raise TypeError("wfmData should be a complex NumPy array.")
 
-        if wfmData.dtype != complex:
+        if not np.iscomplexobj(wfmData):
             raise TypeError("Invalid wfm type. IQ waveforms must be an array of complex values.")
         else:
-            i = self.check_wfm(np.real(wfmData))
-            q = self.check_wfm(np.imag(wfmData))
-
-            wfm = self.iq_wfm_combiner(i, q)
+            # Scale and interleave I and Q in a single pass
+            wfm = self.check_wfm(wfmData, reuseBuffer=True)
 
         # try:
         #     self.write(f'mmemory:delete "D:\\Users\\Instrument\\Documents\\Keysight\\PathWave\\SignalGenerator\\Waveforms\\{wfmID}.bin"')
@@ -2190,7 +2549,7 @@ class VXG(SignalGeneratorBase):
         iq[1::2] = q
         return iq
 
-    def check_wfm(self, wfm):
+    def check_wfm(self, wfm, reuseBuffer=False):
         """
         HELPER FUNCTION
         Checks minimum size and granularity and returns waveform with
@@ -2199,8 +2558,12 @@ class VXG(SignalGeneratorBase):
 
         See pages 205-256 in Keysight X-Series Signal Generators Programming
         Guide (November 2014 Edition) for more info.
+        Complex waveforms are returned with I and Q interleaved.
         Args:
             wfm (NumPy array): Unscaled/unformatted waveform data.
+            reuseBuffer (bool): Write into the reusable waveform buffer instead of a new array. The returned array is then a view
+                into a buffer shared by every download_wfm() and reuseBuffer=True call on this instance, so it is overwritten
+                by the next one. Copy it if it needs to be kept.
 
         Returns:
             (NumPy array): Waveform data that has been scaled and
@@ -2216,7 +2579,15 @@ class VXG(SignalGeneratorBase):
         if rl % self.gran != 0:
             raise error.GranularityError(f"Waveform must have a granularity of {self.gran}.")
 
-        return np.array(self.binMult * wfm, dtype=np.int16).byteswap()
+        # Complex samples are stored as real/imag pairs, so a float view is already in interleaved IQ order.
+        # The view keeps the precision of the samples, just like np.real() and np.imag() do
+        if np.iscomplexobj(wfm):
+            wfm = np.ascontiguousarray(wfm).view(wfm.real.dtype)
+
+        out = self.wfm_buffer(len(wfm), np.int16) if reuseBuffer else None
+        wfm = wfm_scaler(wfm, self.binMult, dtype=np.int16, out=out)
+        # Swap byte order in place rather than making a second copy
+        return wfm.byteswap(inplace=True)
 
     def delete_wfm(self, wfmID):
         """
@@ -12,6 +12,8 @@ import socketscpi
 import warnings
 from pyarbtools import error
 from fractions import Fraction
+from functools import lru_cache
+from types import MappingProxyType
 import os
 import cmath
 from warnings import warn
@@ -70,11 +72,9 @@ class WFM:
                 if vsaCompatible:
                     f.write(f"XDelta, {1 / self.fs}\n")
                 if self.wfmFormat == "real":
-                    for d in self.data:
-                        f.write(f"{d}\n")
+                    write_csv_samples(f, self.data, iq=False)
                 elif self.wfmFormat == "iq":
-                    for d in self.data:
-                        f.write(f"{d.real}, {d.imag}\n")
+                    write_csv_samples(f, self.data, iq=True)
                 else:
                     raise error.WfmBuilderError('Invalid type for "data". Must be a NumPy array of complex or float.')
         except AttributeError:
@@ -102,55 +102,11 @@ class WFM:
                 wfmFormat (str): Waveform format ('iq', or 'real')
         """
 
-        # Check for existing filename with the correct extension
-        if not os.path.exists(fileName):
-            raise IOError("Invalid fileName for import .mat file")
-        _, ext = os.path.splitext(fileName)
-        if not ext == ".mat":
-            raise IOError("File must have .mat extension")
-        matData = scipy.io.loadmat(fileName)
-
-        # Check which variables contain valid data
-        data_vars = []
-        # if the target variable exists, just use that as the source of the waveform data
-        if targetVariable in matData.keys():
-            data_vars.append(targetVariable)
-        # Otherwise hunt for valid arrays
-        else:
-            # Eliminate boilerplate Matlab variables and check for valid NumPy arrays
-            for key, value in matData.items():
-                if (key[:2] != "__" and key[-2:] != "__") and isinstance(value, np.ndarray) and value.size > 1:
-                    data_vars.append(key)
-        # One array probably means a single complex array or a real array
-        if len(data_vars) == 1:
-            var = data_vars[0]
-            # Numpy arrays in .mat file are sometimes needlessly 2D, so flatten just in case
-            self.data = matData[var].flatten()
-            self.wfmFormat = "iq" if matData[var].dtype == np.dtype("complex") else "real"
-        # 2 arrays probably means i and q have been separated
-        elif len(data_vars) == 2:
-            if "i" in [k.lower() for k in matData.keys()] and "q" in [k.lower() for k in matData.keys()]:
-                i = matData["i"].flatten()
-                q = matData["q"].flatten()
-                if i.size != q.size:
-                    raise error.WfmBuilderError("I and Q must contain same number of elements in mat file")
-                # Combine into single complex array
-                self.data = np.array(i + 1j * q)
-                self.wfmFormat = "iq"
-            else:
-                raise error.WfmBuilderError("Need variables 'I' and 'Q' in .mat file")
-        else:
-            raise error.WfmBuilderError("Too many data arrays in .mat file")
-
-        # Check for optional variables
-        if "wfmID" in matData.keys():
-            self.wfmID = matData["wfmID"][0]
-        else:
-            self.wfmID = "wfm"
-        if "fs" in matData.keys():
-            self.fs = float(matData["fs"][0, 0])
-        else:
-            self.fs = 1
+        matData = import_mat(fileName, targetVariable=targetVariable)
+        self.data = matData["data"]
+        self.fs = matData["fs"]
+        self.wfmID = matData["wfmID"]
+        self.wfmFormat = matData["wfmFormat"]
 
     def repeat(self, numRepeats=2):
         """
@@ -171,6 +127,27 @@ class WFM:
         plt.show()
 
 
+def write_csv_samples(f, data, iq):
+    """
+    HELPER FUNCTION
+    Writes waveform samples to an open text file, one sample or I, Q pair per line.
+    Samples are converted to Python floats a block at a time and streamed out with writelines(),
+    so a long waveform is never held in memory as one list or one string.
+    Args:
+        f (file): Text file opened for writing.
+        data (NumPy array): Waveform samples.
+        iq (bool): Writes the real and imaginary parts of each sample as comma separated I and Q values.
+    """
+
+    blockSize = 2 ** 16
+    for start in range(0, len(data), blockSize):
+        block = data[start : start + blockSize]
+        if iq:
+            f.writelines(f"{i}, {q}\n" for i, q in zip(block.real.tolist(), block.imag.tolist()))
+        else:
+            f.writelines(f"{d}\n" for d in block.tolist())
+
+
 def export_wfm(data, fileName, vsaCompatible=False, fs=0):
     """
     Takes in waveform data and exports it to a file as plain text.
@@ -187,12 +164,10 @@ def export_wfm(data, fileName, vsaCompatible=False, fs=0):
             # f.write('# Waveform created with pyarbtools: https://github.com/morgan-at-keysight/pyarbtools')
             if vsaCompatible:
                 f.write(f"XDelta, {1 / fs}\n")
-            if data.dtype == np.float64:
-                for d in data:
-                    f.write(f"{d}\n")
-            elif data.dtype == np.complex128:
-                for d in data:
-                    f.write(f"{d.real}, {d.imag}\n")
+            if np.issubdtype(data.dtype, np.floating):
+                write_csv_samples(f, data, iq=False)
+            elif np.issubdtype(data.dtype, np.complexfloating):
+                write_csv_samples(f, data, iq=True)
             else:
                 raise error.WfmBuilderError('Invalid type for "data". Must be a NumPy array of complex or float.')
     except AttributeError:
@@ -228,34 +203,47 @@ def import_mat(fileName, targetVariable="data"):
     _, ext = os.path.splitext(fileName)
     if not ext == ".mat":
         raise IOError("File must have .mat extension")
-    matData = scipy.io.loadmat(fileName)
+
+    # List the variables without loading them so only the ones that are needed get read into memory
+    try:
+        matVars = {name: (shape, varClass) for name, shape, varClass in scipy.io.whosmat(fileName)}
+    except NotImplementedError:
+        raise error.WfmBuilderError("MATLAB v7.3 .mat files are not supported. Save the file with the '-v7' option.")
 
     # Check which variables contain valid data
     data_vars = []
     # if the target variable exists, just use that as the source of the waveform data
-    if targetVariable in matData.keys():
+    if targetVariable in matVars.keys():
         data_vars.append(targetVariable)
     # Otherwise hunt for valid arrays
     else:
-        # Eliminate boilerplate Matlab variables and check for valid NumPy arrays
-        for key, value in matData.items():
-            if (key[:2] != "__" and key[-2:] != "__") and isinstance(value, np.ndarray) and value.size > 1:
+        # Eliminate boilerplate Matlab variables and strings and check for arrays with more than one element
+        for key, (shape, varClass) in matVars.items():
+            if (key[:2] != "__" and key[-2:] != "__") and varClass != "char" and np.prod(shape) > 1:
                 data_vars.append(key)
+
+    # squeeze_me removes the needless extra dimensions Matlab adds to vectors and scalars
+    optional_vars = [key for key in ["wfmID", "fs"] if key in matVars.keys()]
+    matData = scipy.io.loadmat(fileName, squeeze_me=True, variable_names=data_vars[:2] + optional_vars)
+
     # One array probably means a single complex array or a real array
     if len(data_vars) == 1:
         var = data_vars[0]
-        # Numpy arrays in .mat file are sometimes needlessly 2D, so flatten just in case
-        data = matData[var].flatten()
-        wfmFormat = "iq" if matData[var].dtype == np.dtype("complex") else "real"
+        # ravel() still guards against true 2D arrays, but doesn't copy 1D ones
+        data = np.ravel(matData[var])
+        wfmFormat = "iq" if np.iscomplexobj(data) else "real"
     # 2 arrays probably means i and q have been separated
     elif len(data_vars) == 2:
-        if "i" in [k.lower() for k in matData.keys()] and "q" in [k.lower() for k in matData.keys()]:
-            i = matData["i"].flatten()
-            q = matData["q"].flatten()
+        names = {k.lower(): k for k in data_vars}
+        if "i" in names.keys() and "q" in names.keys():
+            i = np.ravel(matData[names["i"]])
+            q = np.ravel(matData[names["q"]])
             if i.size != q.size:
                 raise error.WfmBuilderError("I and Q must contain same number of elements in mat file")
-            # Combine into single complex array
-            data = np.array(i + 1j * q)
+            # Combine into single complex array, writing I and Q straight into it rather than building 1j * q and the sum
+            data = np.empty(i.size, dtype=complex)
+            data.real = i
+            data.imag = q
             wfmFormat = "iq"
         else:
             raise error.WfmBuilderError("Need variables 'I' and 'Q' in .mat file")
@@ -264,11 +252,11 @@ def import_mat(fileName, targetVariable="data"):
 
     # Check for optional variables
     if "wfmID" in matData.keys():
-        wfmID = matData["wfmID"][0]
+        wfmID = str(matData["wfmID"])
     else:
         wfmID = "wfm"
     if "fs" in matData.keys():
-        fs = float(matData["fs"][0, 0])
+        fs = float(matData["fs"])
     else:
         fs = 1
 
@@ -474,7 +462,9 @@ def chirp_generator(
 
     rl = int(fs * pWidth)
     chirpRate = chirpBw / pWidth
-    t = np.linspace(-rl / fs / 2, rl / fs / 2, rl, endpoint=False)
+    # Sample index relative to the center of the pulse, t = n / fs
+    n = np.arange(rl, dtype=np.float64)
+    n -= rl / 2
 
     """Direct phase manipulation was used to create the chirp modulation.
     https://en.wikipedia.org/wiki/Chirp#Linear
@@ -482,25 +472,33 @@ def chirp_generator(
     Since this is a baseband modulation scheme, there is no f0 term and the
     factors of 2 cancel out. It looks odd to have a pi multiplier rather than
     2*pi, but the math works out correctly. Just throw that into the complex
-    exponential function and you're off to the races."""
+    exponential function and you're off to the races.
+    The time scaling is folded into the constant so the phase is built in a
+    single buffer."""
+
+    mod = np.square(n)
+    mod *= np.pi * chirpRate / (fs * fs)
+
+    # Allocate the full pulse + dead time up front and write the pulse into it directly
+    if pri > pWidth:
+        length = rl + int(fs * pri - rl)
+    else:
+        length = rl
 
-    mod = np.pi * chirpRate * t ** 2
     if wfmFormat.lower() == "iq":
-        iq = np.exp(1j * mod)
+        # exp(1j * mod) = cos(mod) + 1j * sin(mod), written straight into the real and imaginary parts
+        iq = np.zeros(length, dtype=np.complex128)
+        np.cos(mod, out=iq.real[:rl])
+        np.sin(mod, out=iq.imag[:rl])
         if zeroLast:
-            iq[-1] = 0
-        if pri > pWidth:
-            deadTime = np.zeros(int(fs * pri - rl))
-            iq = np.append(iq, deadTime)
+            iq[rl - 1] = 0
 
         return iq
 
     elif wfmFormat.lower() == "real":
-        if pri <= pWidth:
-            real = np.cos(2 * np.pi * cf * t + mod)
-        else:
-            deadTime = np.zeros(int(fs * pri - rl))
-            real = np.append(np.cos(2 * np.pi * cf * t + mod), deadTime)
+        mod += n * (2 * np.pi * cf / fs)
+        real = np.zeros(length)
+        np.cos(mod, out=real[:rl])
 
         return real
     else:
@@ -547,33 +545,36 @@ def barker_generator(
         "b13": [1, 1, 1, 1, 1, -1, -1, 1, 1, -1, 1, -1, 1],
     }
 
-    # Create array for each phase shift and concatenate them
-    codeSamples = int(pWidth / len(barkerCodes[code]) * fs)
-    rl = codeSamples * len(barkerCodes[code])
-    barker = []
-    for p in barkerCodes[code]:
-        temp = np.full((codeSamples,), p)
-        barker = np.concatenate([barker, temp])
+    # Phase shift of each code element
+    codePhase = np.pi / 2 * np.asarray(barkerCodes[code], dtype=np.float64)
+    codeSamples = int(pWidth / codePhase.size * fs)
+    rl = codeSamples * codePhase.size
+
+    # Allocate the full pulse + dead time up front and write the pulse into it directly
+    if pri > pWidth:
+        length = rl + int(fs * pri - rl)
+    else:
+        length = rl
 
-    mod = np.pi / 2 * barker
     if wfmFormat.lower() == "iq":
-        iq = np.exp(1j * mod)
+        # Only one complex exponential per code element, broadcast across the samples of that element
+        iq = np.zeros(length, dtype=np.complex128)
+        iq[:rl].reshape(codePhase.size, codeSamples)[...] = np.exp(1j * codePhase)[:, None]
 
         if zeroLast:
-            iq[-1] = 0 + 0j
-        if pri > pWidth:
-            deadTime = np.zeros(int(fs * pri - rl))
-            iq = np.append(iq, deadTime)
+            iq[rl - 1] = 0 + 0j
         return iq
 
     elif wfmFormat.lower() == "real":
-        t = np.linspace(-rl / fs / 2, rl / fs / 2, rl, endpoint=False)
+        # Repeat each phase shift for the duration of one code element. np.repeat() always returns a new, writable array
+        mod = np.repeat(codePhase, codeSamples)
+        # Sample index relative to the center of the pulse, t = n / fs
+        n = np.arange(rl, dtype=np.float64)
+        n -= rl / 2
+        mod += n * (2 * np.pi * cf / fs)
 
-        if pri <= pWidth:
-            real = np.cos(2 * np.pi * cf * t + mod)
-        else:
-            deadTime = np.zeros(int(fs * pri - rl))
-            real = np.append(np.cos(2 * np.pi * cf * t + mod), deadTime)
+        real = np.zeros(length)
+        np.cos(mod, out=real[:rl])
 
         return real
     else:
@@ -727,40 +728,26 @@ def rrc_filter(alpha, length, osFactor, plot=False):
     delay = filterOrder / 2
     t = np.arange(-delay, delay) / osFactor
 
-    # Calculate the impulse response without warning about the inevitable divide by zero operations
-    # I promise we will deal with those down the road
-    with np.errstate(divide="ignore", invalid="ignore"):
-        h = (
-            -4
-            * alpha
-            / osFactor
-            * (np.cos((1 + alpha) * np.pi * t) + np.sin((1 - alpha) * np.pi * t) / (4 * alpha * t))
-            / (np.pi * ((4 * alpha * t) ** 2 - 1))
-        )
-
-    # Find middle point of filter and manually populate the value
-    # np.where returns a list of indices where the argument condition is True in an array. Nice.
-    idx0 = np.where(t == 0)
-    h[idx0] = -1 / (np.pi * osFactor) * (np.pi * (alpha - 1) - 4 * alpha)
-
     # Define machine precision used to check for near-zero values for small-number arithmetic
     eps = np.finfo(float).eps
 
-    # Find locations of divide by zero points
-    divZero = abs(abs(4 * alpha * t) - 1)
-    # np.where returns a list of indices where the argument condition is True. Nice.
-    idx1 = np.where(divZero < np.sqrt(eps))
+    # Find the divide by zero points, everything else uses the general expression
+    # np.sinc() absorbs the 0/0 at the middle point of the filter, so it doesn't need to be handled separately
+    idx1 = abs(abs(4 * alpha * t) - 1) < np.sqrt(eps)
+    general = ~idx1
+    tg = t[general]
+
+    h = np.empty_like(t)
+    h[general] = (
+        ((1 - alpha) * np.sinc((1 - alpha) * tg) + 4 * alpha / np.pi * np.cos((1 + alpha) * np.pi * tg))
+        / (1 - (4 * alpha * tg) ** 2)
+        / osFactor
+    )
 
     # Manually populate divide by zero points
-    h[idx1] = (
-        1
-        / (2 * np.pi * osFactor)
-        * (
-            np.pi * (alpha + 1) * np.sin(np.pi * (alpha + 1) / (4 * alpha))
-            - 4 * alpha * np.sin(np.pi * (alpha - 1) / (4 * alpha))
-            + np.pi * (alpha - 1) * np.cos(np.pi * (alpha - 1) / (4 * alpha))
-        )
-    )
+    if idx1.any():
+        s = np.pi / (4 * alpha)
+        h[idx1] = alpha / (np.sqrt(2) * osFactor) * ((1 + 2 / np.pi) * np.sin(s) + (1 - 2 / np.pi) * np.cos(s))
 
     # Normalize filter energy to 1
     h = h / np.sqrt(np.sum(h ** 2))
@@ -790,14 +777,18 @@ def rc_filter(alpha, length, L, plot=False):
     """
 
     t = np.arange(-length / 2, length / 2 + 1 / L, 1 / L)  # +/- discrete-time base
-    with np.errstate(divide="ignore", invalid="ignore"):
-        A = np.divide(np.sin(np.pi * t), (np.pi * t))  # assume Tsym=1
-    B = np.divide(np.cos(np.pi * alpha * t), 1 - (2 * alpha * t) ** 2)
-    h = A * B
-    # Handle singularities
-    h[np.argwhere(np.isnan(h))] = 1  # singularity at p(t=0)
-    # singularity at t = +/- Tsym/2alpha
-    h[np.argwhere(np.isinf(h))] = (alpha / 2) * np.sin(np.divide(np.pi, (2 * alpha)))
+
+    # Find the singularities at t = +/- Tsym/2alpha, everything else uses the general expression
+    # np.sinc() already handles the singularity at p(t=0)
+    eps = np.finfo(float).eps
+    idx1 = abs(abs(2 * alpha * t) - 1) < np.sqrt(eps)
+    general = ~idx1
+    tg = t[general]
+
+    h = np.empty_like(t)
+    h[general] = np.sinc(tg) * np.cos(np.pi * alpha * tg) / (1 - (2 * alpha * tg) ** 2)  # assume Tsym=1
+    if idx1.any():
+        h[idx1] = (alpha / 2) * np.sin(np.pi / (2 * alpha))
 
     if plot:
         plt.plot(h)
@@ -827,127 +818,196 @@ def rc_filter(alpha, length, L, plot=False):
 #     return time, h
 
 
+def bits_to_symbols(data, bitsPerSym):
+    """
+    HELPER FUNCTION
+    Groups a list of bits into symbols and returns the integer value of each
+    symbol, which the modulators use as an index into their symbol lookup table.
+    Leftover bits that don't make up a whole symbol are ignored.
+    Args:
+        data (list or NumPy array): Bits (0 or 1), most significant bit of each symbol first.
+        bitsPerSym (int): Number of bits per symbol (1 to 8).
+
+    Returns:
+        (NumPy array): Integer symbol values.
+    """
+
+    bits = np.asarray(data)
+    # Byte sized bits (e.g. from max_len_seq() or digmod_generator()) are used as uint8 and checked in a single pass
+    if bits.dtype.itemsize == 1 and bits.dtype.kind in "biu":
+        bits = np.ascontiguousarray(bits).view(np.uint8)
+        if bits.max(initial=0) > 1:
+            raise ValueError("Invalid bit value. Data must contain only 0s and 1s.")
+    elif np.any((bits != 0) & (bits != 1)):
+        raise ValueError("Invalid bit value. Data must contain only 0s and 1s.")
+
+    # Right align each symbol's bits in its own byte so a single flat packbits() call, which packs MSB first,
+    # produces the symbol values directly. This is much faster than packing short rows with axis=1.
+    numSymbols = len(bits) // bitsPerSym
+    byteBits = np.zeros((numSymbols, 8), dtype=np.uint8)
+    byteBits[:, 8 - bitsPerSym :] = bits[: numSymbols * bitsPerSym].reshape(numSymbols, bitsPerSym)
+    return np.packbits(byteBits)
+
+
+def symbol_map_to_lut(symbolMap, bitsPerSym, modName):
+    """
+    HELPER FUNCTION
+    Converts a symbol map into a single precision lookup table indexed by the
+    integer value of each symbol, so the modulators can map symbols with a
+    single np.take() rather than a dict lookup per symbol.
+    Args:
+        symbolMap (dict): Keys are strings containing the symbol's binary value, values are the symbol's location in the complex plane.
+        bitsPerSym (int): Number of bits per symbol.
+        modName (str): Name of the modulation type used in error messages.
+
+    Returns:
+        (NumPy array): complex64 lookup table with an entry for every possible symbol value.
+    """
+
+    symbolKeys = [format(i, f"0{bitsPerSym}b") for i in range(2 ** bitsPerSym)]
+
+    # Every possible symbol value must have a location in the complex plane
+    missing = [key for key in symbolKeys if key not in symbolMap]
+    if missing:
+        raise ValueError(f"Invalid {modName} symbol. No location given for {', '.join(missing)}.")
+
+    return np.array([symbolMap[key] for key in symbolKeys], dtype=np.complex64)
+
+
+# The default symbol maps are read-only because each lookup table is built from its map once at import.
+# Pass customMap to a modulator to use different symbol locations.
+bpskMap = MappingProxyType({"0": 1 + 0j, "1": -1 + 0j})
+bpskLut = symbol_map_to_lut(bpskMap, 1, "BPSK")
+bpskLut.setflags(write=False)
+
+
 def bpsk_modulator(data, customMap=None):
-    """Converts list of bits to symbol values as strings, maps each
+    """Converts list of bits to integer symbol values, maps each
     symbol value to a position on the complex plane, and returns an
-    array of complex values for BPSK.
+    array of complex64 values for BPSK.
 
     customMap is a dict whos keys are strings containing the symbol's
     binary value and whos values are the symbol's location in the
-    complex plane.
+    complex plane. Every possible symbol value must be included.
     e.g. customMap = {'0101': 0.707 + 0.707j, ...}"""
 
-    pattern = [str(d) for d in data]
+    symbols = bits_to_symbols(data, 1)
+
     if customMap:
-        bpskMap = customMap
+        lut = symbol_map_to_lut(customMap, 1, "BPSK")
     else:
-        bpskMap = {"0": 1 + 0j, "1": -1 + 0j}
+        lut = bpskLut
+
+    return np.take(lut, symbols)
 
-    try:
-        return np.array([bpskMap[p] for p in pattern])
-    except KeyError:
-        raise ValueError("Invalid BPSK symbol value.")
+
+qpskMap = MappingProxyType({"00": 1 + 1j, "01": -1 + 1j, "10": -1 - 1j, "11": 1 - 1j})
+qpskLut = symbol_map_to_lut(qpskMap, 2, "QPSK")
+qpskLut.setflags(write=False)
 
 
 def qpsk_modulator(data, customMap=None):
-    """Converts list of bits to symbol values as strings, maps each
+    """Converts list of bits to integer symbol values, maps each
     symbol value to a position on the complex plane, and returns an
-    array of complex values for QPSK.
+    array of complex64 values for QPSK.
 
     customMap is a dict whos keys are strings containing the symbol's
     binary value and whos values are the symbol's location in the
-    complex plane.
+    complex plane. Every possible symbol value must be included.
     e.g. customMap = {'0101': 0.707 + 0.707j, ...}
     """
 
-    pattern = [str(d0) + str(d1) for d0, d1 in zip(data[0::2], data[1::2])]
+    symbols = bits_to_symbols(data, 2)
+
     if customMap:
-        qpskMap = customMap
+        lut = symbol_map_to_lut(customMap, 2, "QPSK")
     else:
-        qpskMap = {"00": 1 + 1j, "01": -1 + 1j, "10": -1 - 1j, "11": 1 - 1j}
+        lut = qpskLut
+
+    return np.take(lut, symbols)
 
-    try:
-        return np.array([qpskMap[p] for p in pattern])
-    except KeyError:
-        raise ValueError("Invalid QPSK symbol.")
+
+psk8Map = MappingProxyType({
+    "000": 1 + 0j,
+    "001": 0.707 + 0.707j,
+    "010": 0 + 1j,
+    "011": -0.707 + 0.707j,
+    "100": -1 + 0j,
+    "101": -0.707 - 0.707j,
+    "110": 0 - 1j,
+    "111": 0.707 - 0.707j,
+})
+psk8Lut = symbol_map_to_lut(psk8Map, 3, "8PSK")
+psk8Lut.setflags(write=False)
 
 
 def psk8_modulator(data, customMap=None):
-    """Converts list of bits to symbol values as strings, maps each
+    """Converts list of bits to integer symbol values, maps each
     symbol value to a position on the complex plane, and returns an
-    array of complex values for 8-PSK.
+    array of complex64 values for 8-PSK.
 
     customMap is a dict whos keys are strings containing the symbol's
     binary value and whos values are the symbol's location in the
-    complex plane.
+    complex plane. Every possible symbol value must be included.
     e.g. customMap = {'0101': 0.707 + 0.707j, ...}
     """
 
-    pattern = [str(d0) + str(d1) + str(d2) for d0, d1, d2 in zip(data[0::3], data[1::3], data[2::3])]
+    symbols = bits_to_symbols(data, 3)
+
     if customMap:
-        psk8Map = customMap
+        lut = symbol_map_to_lut(customMap, 3, "8PSK")
     else:
-        psk8Map = {
-            "000": 1 + 0j,
-            "001": 0.707 + 0.707j,
-            "010": 0 + 1j,
-            "011": -0.707 + 0.707j,
-            "100": -1 + 0j,
-            "101": -0.707 - 0.707j,
-            "110": 0 - 1j,
-            "111": 0.707 - 0.707j,
-        }
-
-    try:
-        return np.array([psk8Map[p] for p in pattern])
-    except KeyError:
-        raise ValueError("Invalid 8PSK symbol.")
+        lut = psk8Lut
+
+    return np.take(lut, symbols)
+
+
+psk16Map = MappingProxyType({
+    "0000": 1 + 0j,
+    "0001": 0.923880 + 0.382683j,
+    "0010": 0.707107 + 0.707107j,
+    "0011": 0.382683 + 0.923880j,
+    "0100": 0 + 1j,
+    "0101": -0.382683 + 0.923880j,
+    "0110": -0.707107 + 0.707107j,
+    "0111": -0.923880 + 0.382683j,
+    "1000": -1 + 0j,
+    "1001": -0.923880 - 0.382683j,
+    "1010": -0.707107 - 0.707107j,
+    "1011": -0.382683 - 0.923880j,
+    "1100": 0 - 1j,
+    "1101": 0.382683 - 0.923880j,
+    "1110": 0.707107 - 0.707107j,
+    "1111": 0.923880 - 0.382683j,
+})
+psk16Lut = symbol_map_to_lut(psk16Map, 4, "16PSK")
+psk16Lut.setflags(write=False)
 
 
 def psk16_modulator(data, customMap=None):
-    """Converts list of bits to symbol values as strings, maps each
+    """Converts list of bits to integer symbol values, maps each
     symbol value to a position on the complex plane, and returns an
-    array of complex values for 16-PSK.
+    array of complex64 values for 16-PSK.
 
     customMap is a dict whos keys are strings containing the symbol's
     binary value and whos values are the symbol's location in the
-    complex plane.
+    complex plane. Every possible symbol value must be included.
     e.g. customMap = {'0101': 0.707 + 0.707j, ...}
     """
 
-    pattern = [str(d0) + str(d1) + str(d2) + str(d3) for d0, d1, d2, d3 in zip(data[0::4], data[1::4], data[2::4], data[3::4])]
+    symbols = bits_to_symbols(data, 4)
     if customMap:
-        psk16Map = customMap
+        lut = symbol_map_to_lut(customMap, 4, "16PSK")
     else:
-        psk16Map = {
-            "0000": 1 + 0j,
-            "0001": 0.923880 + 0.382683j,
-            "0010": 0.707107 + 0.707107j,
-            "0011": 0.382683 + 0.923880j,
-            "0100": 0 + 1j,
-            "0101": -0.382683 + 0.923880j,
-            "0110": -0.707107 + 0.707107j,
-            "0111": -0.923880 + 0.382683j,
-            "1000": -1 + 0j,
-            "1001": -0.923880 - 0.382683j,
-            "1010": -0.707107 - 0.707107j,
-            "1011": -0.382683 - 0.923880j,
-            "1100": 0 - 1j,
-            "1101": 0.382683 - 0.923880j,
-            "1110": 0.707107 - 0.707107j,
-            "1111": 0.923880 - 0.382683j,
-        }
+        lut = psk16Lut
 
-    try:
-        return np.array([psk16Map[p] for p in pattern])
-    except KeyError:
-        raise ValueError("Invalid 16PSK symbol.")
+    return np.take(lut, symbols)
 
 
 def apsk16_modulator(data, ringRatio=2.53, customMap=None):
-    """Converts a list of bits to symbol values as strings, maps each
+    """Converts a list of bits to integer symbol values, maps each
     symbol value to a position on the complex plane, and returns an
-    array of complex values for 16 APSK.
+    array of complex64 values for 16 APSK.
 
     https://public.ccsds.org/Pubs/131x2b1e1.pdf
     """
@@ -958,7 +1018,7 @@ def apsk16_modulator(data, ringRatio=2.53, customMap=None):
     angle = 2 * np.pi / 12
     ao = angle / 2
 
-    pattern = [str(d0) + str(d1) + str(d2) + str(d3) for d0, d1, d2, d3 in zip(data[0::4], data[1::4], data[2::4], data[3::4])]
+    symbols = bits_to_symbols(data, 4)
 
     if customMap:
         apsk16Map = customMap
@@ -982,16 +1042,13 @@ def apsk16_modulator(data, ringRatio=2.53, customMap=None):
             "1111": cmath.rect(r1, 8 * angle - ao),
         }
 
-    try:
-        return np.array([apsk16Map[p] for p in pattern])
-    except KeyError:
-        raise ValueError("Invalid 16APSK symbol.")
+    return np.take(symbol_map_to_lut(apsk16Map, 4, "16APSK"), symbols)
 
 
 def apsk32_modulator(data, ring2Ratio=2.53, ring3Ratio=4.3, customMap=None):
-    """Converts a list of bits to symbol values as strings, maps each
+    """Converts a list of bits to integer symbol values, maps each
     symbol value to a position on the complex plane, and returns an
-    array of complex values for 32 APSK.
+    array of complex64 values for 32 APSK.
 
     https://public.ccsds.org/Pubs/131x2b1e1.pdf
     """
@@ -1004,10 +1061,7 @@ def apsk32_modulator(data, ring2Ratio=2.53, ring3Ratio=4.3, customMap=None):
     a2 = 2 * np.pi / 12
     a2offset = a2 / 2
 
-    pattern = [
-        str(d0) + str(d1) + str(d2) + str(d3) + str(d4)
-        for d0, d1, d2, d3, d4 in zip(data[0::5], data[1::5], data[2::5], data[3::5], data[4::5])
-    ]
+    symbols = bits_to_symbols(data, 5)
 
     if customMap:
         apsk32Map = customMap
@@ -1047,16 +1101,13 @@ def apsk32_modulator(data, ring2Ratio=2.53, ring3Ratio=4.3, customMap=None):
             "11111": cmath.rect(r3, 11 * a3),
         }
 
-    try:
-        return np.array([apsk32Map[p] for p in pattern])
-    except KeyError:
-        raise ValueError("Invalid 32APSK symbol.")
+    return np.take(symbol_map_to_lut(apsk32Map, 5, "32APSK"), symbols)
 
 
 def apsk64_modulator(data, ring2Ratio=2.73, ring3Ratio=4.52, ring4Ratio=6.31, customMap=None):
-    """Converts a list of bits to symbol values as strings, maps each
+    """Converts a list of bits to integer symbol values, maps each
     symbol value to a position on the complex plane, and returns an
-    array of complex values for 64 APSK.
+    array of complex64 values for 64 APSK.
 
     https://public.ccsds.org/Pubs/131x2b1e1.pdf
     """
@@ -1073,10 +1124,7 @@ def apsk64_modulator(data, ring2Ratio=2.73, ring3Ratio=4.52, ring4Ratio=6.31, cu
     a2 = 2 * np.pi / 12
     a2offset = a2 / 2
 
-    pattern = [
-        str(d0) + str(d1) + str(d2) + str(d3) + str(d4) + str(d5)
-        for d0, d1, d2, d3, d4, d5 in zip(data[0::6], data[1::6], data[2::6], data[3::6], data[4::6], data[5::6])
-    ]
+    symbols = bits_to_symbols(data, 6)
 
     if customMap:
         apsk64Map = customMap
@@ -1148,16 +1196,35 @@ def apsk64_modulator(data, ring2Ratio=2.73, ring3Ratio=4.52, ring4Ratio=6.31, cu
             "111111": cmath.rect(r3, 14 * a3 - a3offset),
         }
 
-    try:
-        return np.array([apsk64Map[p] for p in pattern])
-    except KeyError:
-        raise ValueError("Invalid 64APSK symbol.")
+    return np.take(symbol_map_to_lut(apsk64Map, 6, "64APSK"), symbols)
+
+
+qam16Map = MappingProxyType({
+    "0000": -3 - 3j,
+    "0001": -3 - 1j,
+    "0010": -3 + 3j,
+    "0011": -3 + 1j,
+    "0100": -1 - 3j,
+    "0101": -1 - 1j,
+    "0110": -1 + 3j,
+    "0111": -1 + 1j,
+    "1000": 3 - 3j,
+    "1001": 3 - 1j,
+    "1010": 3 + 3j,
+    "1011": 3 + 1j,
+    "1100": 1 - 3j,
+    "1101": 1 - 1j,
+    "1110": 1 + 3j,
+    "1111": 1 + 1j,
+})
+qam16Lut = symbol_map_to_lut(qam16Map, 4, "16 QAM")
+qam16Lut.setflags(write=False)
 
 
 def qam16_modulator(data, customMap=None):
-    """Converts list of bits to symbol values as strings, maps each
+    """Converts list of bits to integer symbol values, maps each
     symbol value to a position on the complex plane, and returns an
-    array of complex values for 16 QAM.
+    array of complex64 values for 16 QAM.
 
     A 4-variable Karnaugh map is used to determine the default symbol
     locations to prevent adjacent symbol errors from differing more
@@ -1166,102 +1233,158 @@ def qam16_modulator(data, customMap=None):
 
     customMap is a dict whos keys are strings containing the symbol's
     binary value and whos values are the symbol's location in the
-    complex plane.
+    complex plane. Every possible symbol value must be included.
     e.g. customMap = {'0101': 0.707 + 0.707j, ...}"""
 
-    pattern = [str(d0) + str(d1) + str(d2) + str(d3) for d0, d1, d2, d3 in zip(data[0::4], data[1::4], data[2::4], data[3::4])]
+    symbols = bits_to_symbols(data, 4)
+
     if customMap:
-        qamMap = customMap
+        lut = symbol_map_to_lut(customMap, 4, "16 QAM")
     else:
-        qamMap = {
-            "0000": -3 - 3j,
-            "0001": -3 - 1j,
-            "0010": -3 + 3j,
-            "0011": -3 + 1j,
-            "0100": -1 - 3j,
-            "0101": -1 - 1j,
-            "0110": -1 + 3j,
-            "0111": -1 + 1j,
-            "1000": 3 - 3j,
-            "1001": 3 - 1j,
-            "1010": 3 + 3j,
-            "1011": 3 + 1j,
-            "1100": 1 - 3j,
-            "1101": 1 - 1j,
-            "1110": 1 + 3j,
-            "1111": 1 + 1j,
-        }
-    try:
-        return np.array([qamMap[p] for p in pattern])
-    except KeyError:
-        raise ValueError("Invalid 16 QAM symbol.")
+        lut = qam16Lut
+
+    return np.take(lut, symbols)
+
+
+qam32Map = MappingProxyType({
+    "00000": -3 - 5j,
+    "00001": -1 - 5j,
+    "00010": -1 + 5j,
+    "00011": -3 + 5j,
+    "00100": -5 - 3j,
+    "00101": -5 - 1j,
+    "00110": -5 + 3j,
+    "00111": -5 + 1j,
+    "01000": -1 - 3j,
+    "01001": -1 - 1j,
+    "01010": -1 + 3j,
+    "01011": -1 + 1j,
+    "01100": -3 - 3j,
+    "01101": -3 - 1j,
+    "01110": -3 + 3j,
+    "01111": -3 + 1j,
+    "10000": 3 - 5j,
+    "10001": 1 - 5j,
+    "10010": 1 + 5j,
+    "10011": 3 + 5j,
+    "10100": 5 - 3j,
+    "10101": 5 - 1j,
+    "10110": 5 + 3j,
+    "10111": 5 + 1j,
+    "11000": 1 - 3j,
+    "11001": 1 - 1j,
+    "11010": 1 + 3j,
+    "11011": 1 + 1j,
+    "11100": 3 - 3j,
+    "11101": 3 - 1j,
+    "11110": 3 + 3j,
+    "11111": 3 + 1j,
+})
+qam32Lut = symbol_map_to_lut(qam32Map, 5, "32 QAM")
+qam32Lut.setflags(write=False)
 
 
 def qam32_modulator(data, customMap=None):
-    """Converts list of bits to symbol values as strings, maps each
+    """Converts list of bits to integer symbol values, maps each
     symbol value to a position on the complex plane, and returns an
-    array of complex values for 32 QAM.
+    array of complex64 values for 32 QAM.
 
-    A 5-variable Karnaugh map is used to determine the default symbol
-    locations to prevent adjacent symbol errors from differing more
-    than 1 bit from the intended symbol.
+    The default symbol locations form a cross constellation. They come
+    from a Gray coded 8x4 rectangular constellation whose outer columns
+    are folded onto the top and bottom rows. A cross constellation can't
+    be Gray coded perfectly, so the mapping is only quasi-Gray: 6 of the
+    52 pairs of adjacent symbols (the ones next to the folded points)
+    differ by more than 1 bit.
 
     customMap is a dict whos keys are strings containing the symbol's
     binary value and whos values are the symbol's location in the
-    complex plane.
+    complex plane. Every possible symbol value must be included.
     e.g. customMap = {'0101': 0.707 + 0.707j, ...}"""
 
-    pattern = [
-        str(d0) + str(d1) + str(d2) + str(d3) + str(d4)
-        for d0, d1, d2, d3, d4 in zip(data[0::5], data[1::5], data[2::5], data[3::5], data[4::5])
-    ]
+    symbols = bits_to_symbols(data, 5)
+
     if customMap:
-        qamMap = customMap
+        lut = symbol_map_to_lut(customMap, 5, "32 QAM")
     else:
-        qamMap = {
-            "00000": -3 + 5j,
-            "00001": -5 - 1j,
-            "00010": 3 + 3j,
-            "00011": -3 - 1j,
-            "00100": -5 + 3j,
-            "00101": 3 - 1j,
-            "00110": -1 + 1j,
-            "00111": -3 - 5j,
-            "01000": 1 + 5j,
-            "01001": -1 - 1j,
-            "01010": -5 + 1j,
-            "01011": 3 - 3j,
-            "01100": -1 + 3j,
-            "01101": -5 - 3j,
-            "01110": 3 + 1j,
-            "01111": 1 - 5j,
-            "10000": -1 + 5j,
-            "10001": -3 - 1j,
-            "10010": 5 + 3j,
-            "10011": 1 - 3j,
-            "10100": -3 + 3j,
-            "10101": 5 - 1j,
-            "10110": 1 + 1j,
-            "10111": -1 - 5j,
-            "11000": 3 + 5j,
-            "11001": 1 - 1j,
-            "11010": -3 + 1j,
-            "11011": 5 - 3j,
-            "11100": 1 + 3j,
-            "11101": -3 - 3j,
-            "11110": 5 + 1j,
-            "11111": 3 - 3j,
-        }
-    try:
-        return np.array([qamMap[p] for p in pattern])
-    except KeyError:
-        raise ValueError("Invalid 32 QAM symbol.")
+        lut = qam32Lut
+
+    return np.take(lut, symbols)
+
+
+qam64Map = MappingProxyType({
+    "000000": 7 + 7j,
+    "000001": 7 + 5j,
+    "000010": 5 + 7j,
+    "000011": 5 + 5j,
+    "000100": 7 + 1j,
+    "000101": 7 + 3j,
+    "000110": 5 + 1j,
+    "000111": 5 + 3j,
+    "001000": 1 + 7j,
+    "001001": 1 + 5j,
+    "001010": 3 + 7j,
+    "001011": 3 + 5j,
+    "001100": 1 + 1j,
+    "001101": 1 + 3j,
+    "001110": 3 + 1j,
+    "001111": 3 + 3j,
+    "010000": 7 - 7j,
+    "010001": 7 - 5j,
+    "010010": 5 - 7j,
+    "010011": 5 - 5j,
+    "010100": 7 - 1j,
+    "010101": 7 - 3j,
+    "010110": 5 - 1j,
+    "010111": 5 - 3j,
+    "011000": 1 - 7j,
+    "011001": 1 - 5j,
+    "011010": 3 - 7j,
+    "011011": 3 - 5j,
+    "011100": 1 - 1j,
+    "011101": 1 - 3j,
+    "011110": 3 - 1j,
+    "011111": 3 - 3j,
+    "100000": -7 + 7j,
+    "100001": -7 + 5j,
+    "100010": -5 + 7j,
+    "100011": -5 + 5j,
+    "100100": -7 + 1j,
+    "100101": -7 + 3j,
+    "100110": -5 + 1j,
+    "100111": -5 + 3j,
+    "101000": -1 + 7j,
+    "101001": -1 + 5j,
+    "101010": -3 + 7j,
+    "101011": -3 + 5j,
+    "101100": -1 + 1j,
+    "101101": -1 + 3j,
+    "101110": -3 + 1j,
+    "101111": -3 + 3j,
+    "110000": -7 - 7j,
+    "110001": -7 - 5j,
+    "110010": -5 - 7j,
+    "110011": -5 - 5j,
+    "110100": -7 - 1j,
+    "110101": -7 - 3j,
+    "110110": -5 - 1j,
+    "110111": -5 - 3j,
+    "111000": -1 - 7j,
+    "111001": -1 - 5j,
+    "111010": -3 - 7j,
+    "111011": -3 - 5j,
+    "111100": -1 - 1j,
+    "111101": -1 - 3j,
+    "111110": -3 - 1j,
+    "111111": -3 - 3j,
+})
+qam64Lut = symbol_map_to_lut(qam64Map, 6, "64 QAM")
+qam64Lut.setflags(write=False)
 
 
 def qam64_modulator(data, customMap=None):
-    """Converts list of bits to symbol values as strings, maps each
+    """Converts list of bits to integer symbol values, maps each
     symbol value to a position on the complex plane, and returns an
-    array of complex values for 64 QAM.
+    array of complex64 values for 64 QAM.
 
     A 6-variable Karnaugh map is used to determine the default symbol
     locations to prevent adjacent symbol errors from differing more
@@ -1269,92 +1392,156 @@ def qam64_modulator(data, customMap=None):
 
     customMap is a dict whos keys are strings containing the symbol's
     binary value and whos values are the symbol's location in the
-    complex plane.
+    complex plane. Every possible symbol value must be included.
     e.g. customMap = {'0101': 0.707 + 0.707j, ...}"""
 
-    pattern = [
-        str(d0) + str(d1) + str(d2) + str(d3) + str(d4) + str(d5)
-        for d0, d1, d2, d3, d4, d5 in zip(data[0::6], data[1::6], data[2::6], data[3::6], data[4::6], data[5::6])
-    ]
+    symbols = bits_to_symbols(data, 6)
     if customMap:
-        qamMap = customMap
+        lut = symbol_map_to_lut(customMap, 6, "64 QAM")
     else:
-        qamMap = {
-            "000000": 7 + 7j,
-            "000001": 7 + 5j,
-            "000010": 5 + 7j,
-            "000011": 5 + 5j,
-            "000100": 7 + 1j,
-            "000101": 7 + 3j,
-            "000110": 5 + 1j,
-            "000111": 5 + 3j,
-            "001000": 1 + 7j,
-            "001001": 1 + 5j,
-            "001010": 3 + 7j,
-            "001011": 3 + 5j,
-            "001100": 1 + 1j,
-            "001101": 1 + 3j,
-            "001110": 3 + 1j,
-            "001111": 3 + 3j,
-            "010000": 7 - 7j,
-            "010001": 7 - 5j,
-            "010010": 5 - 7j,
-            "010011": 5 - 5j,
-            "010100": 7 - 1j,
-            "010101": 7 - 3j,
-            "010110": 5 - 1j,
-            "010111": 5 - 3j,
-            "011000": 1 - 7j,
-            "011001": 1 - 5j,
-            "011010": 3 - 7j,
-            "011011": 3 - 5j,
-            "011100": 1 - 1j,
-            "011101": 1 - 3j,
-            "011110": 3 - 1j,
-            "011111": 3 - 3j,
-            "100000": -7 + 7j,
-            "100001": -7 + 5j,
-            "100010": -5 + 7j,
-            "100011": -5 + 5j,
-            "100100": -7 + 1j,
-            "100101": -7 + 3j,
-            "100110": -5 + 1j,
-            "100111": -5 + 3j,
-            "101000": -1 + 7j,
-            "101001": -1 + 5j,
-            "101010": -3 + 7j,
-            "101011": -3 + 5j,
-            "101100": -1 + 1j,
-            "101101": -1 + 3j,
-            "101110": -3 + 1j,
-            "101111": -3 + 3j,
-            "110000": -7 - 7j,
-            "110001": -7 - 5j,
-            "110010": -5 - 7j,
-            "110011": -5 - 5j,
-            "110100": -7 - 1j,
-            "110101": -7 - 3j,
-            "110110": -5 - 1j,
-            "110111": -5 - 3j,
-            "111000": -1 - 7j,
-            "111001": -1 - 5j,
-            "111010": -3 - 7j,
-            "111011": -3 - 5j,
-            "111100": -1 - 1j,
-            "111101": -1 - 3j,
-            "111110": -3 - 1j,
-            "111111": -3 - 3j,
-        }
-    try:
-        return np.array([qamMap[p] for p in pattern])
-    except KeyError:
-        raise ValueError("Invalid 64 QAM symbol.")
+        lut = qam64Lut
+
+    return np.take(lut, symbols)
+
+
+qam128Map = MappingProxyType({
+    "0000000": 1 + 1j,
+    "0000001": 1 + 3j,
+    "0000010": 1 + 5j,
+    "0000011": 1 + 7j,
+    "0000100": 1 + 9j,
+    "0000101": 1 + 11j,
+    "0000110": 1 - 11j,
+    "0000111": 1 - 9j,
+    "0001000": 1 - 7j,
+    "0001001": 1 - 5j,
+    "0001010": 1 - 3j,
+    "0001011": 1 - 1j,
+    "0001100": 3 + 1j,
+    "0001101": 3 + 3j,
+    "0001110": 3 + 5j,
+    "0001111": 3 + 7j,
+    "0010000": 3 + 9j,
+    "0010001": 3 + 11j,
+    "0010010": 3 - 11j,
+    "0010011": 3 - 9j,
+    "0010100": 3 - 7j,
+    "0010101": 3 - 5j,
+    "0010110": 3 - 3j,
+    "0010111": 3 - 1j,
+    "0011000": 5 + 1j,
+    "0011001": 5 + 3j,
+    "0011010": 5 + 5j,
+    "0011011": 5 + 7j,
+    "0011100": 5 + 9j,
+    "0011101": 5 + 11j,
+    "0011110": 5 - 11j,
+    "0011111": 5 - 9j,
+    "0100000": 5 - 7j,
+    "0100001": 5 - 5j,
+    "0100010": 5 - 3j,
+    "0100011": 5 - 1j,
+    "0100100": 7 + 1j,
+    "0100101": 7 + 3j,
+    "0100110": 7 + 5j,
+    "0100111": 7 + 7j,
+    "0101000": 7 + 9j,
+    "0101001": 7 + 11j,
+    "0101010": 7 - 11j,
+    "0101011": 7 - 9j,
+    "0101100": 7 - 7j,
+    "0101101": 7 - 5j,
+    "0101110": 7 - 3j,
+    "0101111": 7 - 1j,
+    "0110000": 9 + 1j,
+    "0110001": 9 + 3j,
+    "0110010": 9 + 5j,
+    "0110011": 9 + 7j,
+    "0110100": 9 - 7j,
+    "0110101": 9 - 5j,
+    "0110110": 9 - 3j,
+    "0110111": 9 - 1j,
+    "0111000": 1 + 1j,
+    "0111001": 1 + 3j,
+    "0111010": 1 + 5j,
+    "0111011": 1 + 7j,
+    "0111100": 1 - 7j,
+    "0111101": 1 - 5j,
+    "0111110": 1 - 3j,
+    "0111111": 1 - 1j,
+    "1000000": -1 + 1j,
+    "1000001": -1 + 3j,
+    "1000010": -1 + 5j,
+    "1000011": -1 + 7j,
+    "1000100": -1 - 7j,
+    "1000101": -1 - 5j,
+    "1000110": -1 - 3j,
+    "1000111": -1 - 1j,
+    "1001000": -9 + 1j,
+    "1001001": -9 + 3j,
+    "1001010": -9 + 5j,
+    "1001011": -9 + 7j,
+    "1001100": -9 - 7j,
+    "1001101": -9 - 5j,
+    "1001110": -9 - 3j,
+    "1001111": -9 - 1j,
+    "1010000": -7 + 1j,
+    "1010001": -7 + 3j,
+    "1010010": -7 + 5j,
+    "1010011": -7 + 7j,
+    "1010100": -7 + 9j,
+    "1010101": -7 + 11j,
+    "1010110": -7 - 11j,
+    "1010111": -7 - 9j,
+    "1011000": -7 - 7j,
+    "1011001": -7 - 5j,
+    "1011010": -7 - 3j,
+    "1011011": -7 - 1j,
+    "1011100": -5 + 1j,
+    "1011101": -5 + 3j,
+    "1011110": -5 + 5j,
+    "1011111": -5 + 7j,
+    "1100000": -5 + 9j,
+    "1100001": -5 + 11j,
+    "1100010": -5 - 11j,
+    "1100011": -5 - 9j,
+    "1100100": -5 - 7j,
+    "1100101": -5 - 5j,
+    "1100110": -5 - 3j,
+    "1100111": -5 - 1j,
+    "1101000": -3 + 1j,
+    "1101001": -3 + 3j,
+    "1101010": -3 + 5j,
+    "1101011": -3 + 7j,
+    "1101100": -3 + 9j,
+    "1101101": -3 + 11j,
+    "1101110": -3 - 11j,
+    "1101111": -3 - 9j,
+    "1110000": -3 - 7j,
+    "1110001": -3 - 5j,
+    "1110010": -3 - 3j,
+    "1110011": -3 - 1j,
+    "1110100": -1 + 1j,
+    "1110101": -1 + 3j,
+    "1110110": -1 + 5j,
+    "1110111": -1 + 7j,
+    "1111000": -1 + 9j,
+    "1111001": -1 + 11j,
+    "1111010": -1 - 11j,
+    "1111011": -1 - 9j,
+    "1111100": -1 - 7j,
+    "1111101": -1 - 5j,
+    "1111110": -1 - 3j,
+    "1111111": -1 - 1j,
+})
+qam128Lut = symbol_map_to_lut(qam128Map, 7, "128 QAM")
+qam128Lut.setflags(write=False)
 
 
 def qam128_modulator(data, customMap=None):
-    """Converts list of bits to symbol values as strings, maps each
+    """Converts list of bits to integer symbol values, maps each
     symbol value to a position on the complex plane, and returns an
-    array of complex values for 128 QAM.
+    array of complex64 values for 128 QAM.
 
     A 7-variable Karnaugh map is used to determine the default symbol
     locations to prevent adjacent symbol errors from differing more
@@ -1362,164 +1549,284 @@ def qam128_modulator(data, customMap=None):
 
     customMap is a dict whos keys are strings containing the symbol's
     binary value and whos values are the symbol's location in the
-    complex plane.
+    complex plane. Every possible symbol value must be included.
     e.g. customMap = {'0101': 0.707 + 0.707j, ...}"""
 
-    pattern = [
-        str(d0) + str(d1) + str(d2) + str(d3) + str(d4) + str(d5) + str(d6)
-        for d0, d1, d2, d3, d4, d5, d6 in zip(
-            data[0::7],
-            data[1::7],
-            data[2::7],
-            data[3::7],
-            data[4::7],
-            data[5::7],
-            data[6::7],
-        )
-    ]
+    symbols = bits_to_symbols(data, 7)
     if customMap:
-        qamMap = customMap
+        lut = symbol_map_to_lut(customMap, 7, "128 QAM")
     else:
-        qamMap = {
-            "0000000": 1 + 1j,
-            "0000001": 1 + 3j,
-            "0000010": 1 + 5j,
-            "0000011": 1 + 7j,
-            "0000100": 1 + 9j,
-            "0000101": 1 + 11j,
-            "0000110": 1 - 11j,
-            "0000111": 1 - 9j,
-            "0001000": 1 - 7j,
-            "0001001": 1 - 5j,
-            "0001010": 1 - 3j,
-            "0001011": 1 - 1j,
-            "0001100": 3 + 1j,
-            "0001101": 3 + 3j,
-            "0001110": 3 + 5j,
-            "0001111": 3 + 7j,
-            "0010000": 3 + 9j,
-            "0010001": 3 + 11j,
-            "0010010": 3 - 11j,
-            "0010011": 3 - 9j,
-            "0010100": 3 - 7j,
-            "0010101": 3 - 5j,
-            "0010110": 3 - 3j,
-            "0010111": 3 - 1j,
-            "0011000": 5 + 1j,
-            "0011001": 5 + 3j,
-            "0011010": 5 + 5j,
-            "0011011": 5 + 7j,
-            "0011100": 5 + 9j,
-            "0011101": 5 + 11j,
-            "0011110": 5 - 11j,
-            "0011111": 5 - 9j,
-            "0100000": 5 - 7j,
-            "0100001": 5 - 5j,
-            "0100010": 5 - 3j,
-            "0100011": 5 - 1j,
-            "0100100": 7 + 1j,
-            "0100101": 7 + 3j,
-            "0100110": 7 + 5j,
-            "0100111": 7 + 7j,
-            "0101000": 7 + 9j,
-            "0101001": 7 + 11j,
-            "0101010": 7 - 11j,
-            "0101011": 7 - 9j,
-            "0101100": 7 - 7j,
-            "0101101": 7 - 5j,
-            "0101110": 7 - 3j,
-            "0101111": 7 - 1j,
-            "0110000": 9 + 1j,
-            "0110001": 9 + 3j,
-            "0110010": 9 + 5j,
-            "0110011": 9 + 7j,
-            "0110100": 9 - 7j,
-            "0110101": 9 - 5j,
-            "0110110": 9 - 3j,
-            "0110111": 9 - 1j,
-            "0111000": 1 + 1j,
-            "0111001": 1 + 3j,
-            "0111010": 1 + 5j,
-            "0111011": 1 + 7j,
-            "0111100": 1 - 7j,
-            "0111101": 1 - 5j,
-            "0111110": 1 - 3j,
-            "0111111": 1 - 1j,
-            "1000000": -1 + 1j,
-            "1000001": -1 + 3j,
-            "1000010": -1 + 5j,
-            "1000011": -1 + 7j,
-            "1000100": -1 - 7j,
-            "1000101": -1 - 5j,
-            "1000110": -1 - 3j,
-            "1000111": -1 - 1j,
-            "1001000": -9 + 1j,
-            "1001001": -9 + 3j,
-            "1001010": -9 + 5j,
-            "1001011": -9 + 7j,
-            "1001100": -9 - 7j,
-            "1001101": -9 - 5j,
-            "1001110": -9 - 3j,
-            "1001111": -9 - 1j,
-            "1010000": -7 + 1j,
-            "1010001": -7 + 3j,
-            "1010010": -7 + 5j,
-            "1010011": -7 + 7j,
-            "1010100": -7 + 9j,
-            "1010101": -7 + 11j,
-            "1010110": -7 - 11j,
-            "1010111": -7 - 9j,
-            "1011000": -7 - 7j,
-            "1011001": -7 - 5j,
-            "1011010": -7 - 3j,
-            "1011011": -7 - 1j,
-            "1011100": -5 + 1j,
-            "1011101": -5 + 3j,
-            "1011110": -5 + 5j,
-            "1011111": -5 + 7j,
-            "1100000": -5 + 9j,
-            "1100001": -5 + 11j,
-            "1100010": -5 - 11j,
-            "1100011": -5 - 9j,
-            "1100100": -5 - 7j,
-            "1100101": -5 - 5j,
-            "1100110": -5 - 3j,
-            "1100111": -5 - 1j,
-            "1101000": -3 + 1j,
-            "1101001": -3 + 3j,
-            "1101010": -3 + 5j,
-            "1101011": -3 + 7j,
-            "1101100": -3 + 9j,
-            "1101101": -3 + 11j,
-            "1101110": -3 - 11j,
-            "1101111": -3 - 9j,
-            "1110000": -3 - 7j,
-            "1110001": -3 - 5j,
-            "1110010": -3 - 3j,
-            "1110011": -3 - 1j,
-            "1110100": -1 + 1j,
-            "1110101": -1 + 3j,
-            "1110110": -1 + 5j,
-            "1110111": -1 + 7j,
-            "1111000": -1 + 9j,
-            "1111001": -1 + 11j,
-            "1111010": -1 - 11j,
-            "1111011": -1 - 9j,
-            "1111100": -1 - 7j,
-            "1111101": -1 - 5j,
-            "1111110": -1 - 3j,
-            "1111111": -1 - 1j,
-        }
-    try:
-        return np.array([qamMap[p] for p in pattern])
-    except KeyError:
-        raise ValueError("Invalid 128 QAM symbol.")
+        lut = qam128Lut
+
+    return np.take(lut, symbols)
+
+
+qam256Map = MappingProxyType({
+    "00000000": +0.06666666667 + 0.06666666667j,
+    "00000001": +0.06666666667 + 0.20000000000j,
+    "00000010": +0.06666666667 + 0.33333333333j,
+    "00000011": +0.06666666667 + 0.46666666667j,
+    "00000100": +0.06666666667 + 0.60000000000j,
+    "00000101": +0.06666666667 + 0.73333333333j,
+    "00000110": +0.06666666667 + 0.86666666667j,
+    "00000111": +0.06666666667 + 1.00000000000j,
+    "00001000": +0.06666666667 - 1.00000000000j,
+    "00001001": +0.06666666667 - 0.86666666667j,
+    "00001010": +0.06666666667 - 0.73333333333j,
+    "00001011": +0.06666666667 - 0.60000000000j,
+    "00001100": +0.06666666667 - 0.46666666667j,
+    "00001101": +0.06666666667 - 0.33333333333j,
+    "00001110": +0.06666666667 - 0.20000000000j,
+    "00001111": +0.06666666667 - 0.06666666667j,
+    "00010000": +0.20000000000 + 0.06666666667j,
+    "00010001": +0.20000000000 + 0.20000000000j,
+    "00010010": +0.20000000000 + 0.33333333333j,
+    "00010011": +0.20000000000 + 0.46666666667j,
+    "00010100": +0.20000000000 + 0.60000000000j,
+    "00010101": +0.20000000000 + 0.73333333333j,
+    "00010110": +0.20000000000 + 0.86666666667j,
+    "00010111": +0.20000000000 + 1.00000000000j,
+    "00011000": +0.20000000000 - 1.00000000000j,
+    "00011001": +0.20000000000 - 0.86666666667j,
+    "00011010": +0.20000000000 - 0.73333333333j,
+    "00011011": +0.20000000000 - 0.60000000000j,
+    "00011100": +0.20000000000 - 0.46666666667j,
+    "00011101": +0.20000000000 - 0.33333333333j,
+    "00011110": +0.20000000000 - 0.20000000000j,
+    "00011111": +0.20000000000 - 0.06666666667j,
+    "00100000": +0.33333333333 + 0.06666666667j,
+    "00100001": +0.33333333333 + 0.20000000000j,
+    "00100010": +0.33333333333 + 0.33333333333j,
+    "00100011": +0.33333333333 + 0.46666666667j,
+    "00100100": +0.33333333333 + 0.60000000000j,
+    "00100101": +0.33333333333 + 0.73333333333j,
+    "00100110": +0.33333333333 + 0.86666666667j,
+    "00100111": +0.33333333333 + 1.00000000000j,
+    "00101000": +0.33333333333 - 1.00000000000j,
+    "00101001": +0.33333333333 - 0.86666666667j,
+    "00101010": +0.33333333333 - 0.73333333333j,
+    "00101011": +0.33333333333 - 0.60000000000j,
+    "00101100": +0.33333333333 - 0.46666666667j,
+    "00101101": +0.33333333333 - 0.33333333333j,
+    "00101110": +0.33333333333 - 0.20000000000j,
+    "00101111": +0.33333333333 - 0.06666666667j,
+    "00110000": +0.46666666667 + 0.06666666667j,
+    "00110001": +0.46666666667 + 0.20000000000j,
+    "00110010": +0.46666666667 + 0.33333333333j,
+    "00110011": +0.46666666667 + 0.46666666667j,
+    "00110100": +0.46666666667 + 0.60000000000j,
+    "00110101": +0.46666666667 + 0.73333333333j,
+    "00110110": +0.46666666667 + 0.86666666667j,
+    "00110111": +0.46666666667 + 1.00000000000j,
+    "00111000": +0.46666666667 - 1.00000000000j,
+    "00111001": +0.46666666667 - 0.86666666667j,
+    "00111010": +0.46666666667 - 0.73333333333j,
+    "00111011": +0.46666666667 - 0.60000000000j,
+    "00111100": +0.46666666667 - 0.46666666667j,
+    "00111101": +0.46666666667 - 0.33333333333j,
+    "00111110": +0.46666666667 - 0.20000000000j,
+    "00111111": +0.46666666667 - 0.06666666667j,
+    "01000000": +0.60000000000 + 0.06666666667j,
+    "01000001": +0.60000000000 + 0.20000000000j,
+    "01000010": +0.60000000000 + 0.33333333333j,
+    "01000011": +0.60000000000 + 0.46666666667j,
+    "01000100": +0.60000000000 + 0.60000000000j,
+    "01000101": +0.60000000000 + 0.73333333333j,
+    "01000110": +0.60000000000 + 0.86666666667j,
+    "01000111": +0.60000000000 + 1.00000000000j,
+    "01001000": +0.60000000000 - 1.00000000000j,
+    "01001001": +0.60000000000 - 0.86666666667j,
+    "01001010": +0.60000000000 - 0.73333333333j,
+    "01001011": +0.60000000000 - 0.60000000000j,
+    "01001100": +0.60000000000 - 0.46666666667j,
+    "01001101": +0.60000000000 - 0.33333333333j,
+    "01001110": +0.60000000000 - 0.20000000000j,
+    "01001111": +0.60000000000 - 0.06666666667j,
+    "01010000": +0.73333333333 + 0.06666666667j,
+    "01010001": +0.73333333333 + 0.20000000000j,
+    "01010010": +0.73333333333 + 0.33333333333j,
+    "01010011": +0.73333333333 + 0.46666666667j,
+    "01010100": +0.73333333333 + 0.60000000000j,
+    "01010101": +0.73333333333 + 0.73333333333j,
+    "01010110": +0.73333333333 + 0.86666666667j,
+    "01010111": +0.73333333333 + 1.00000000000j,
+    "01011000": +0.73333333333 - 1.00000000000j,
+    "01011001": +0.73333333333 - 0.86666666667j,
+    "01011010": +0.73333333333 - 0.73333333333j,
+    "01011011": +0.73333333333 - 0.60000000000j,
+    "01011100": +0.73333333333 - 0.46666666667j,
+    "01011101": +0.73333333333 - 0.33333333333j,
+    "01011110": +0.73333333333 - 0.20000000000j,
+    "01011111": +0.73333333333 - 0.06666666667j,
+    "01100000": +0.86666666667 + 0.06666666667j,
+    "01100001": +0.86666666667 + 0.20000000000j,
+    "01100010": +0.86666666667 + 0.33333333333j,
+    "01100011": +0.86666666667 + 0.46666666667j,
+    "01100100": +0.86666666667 + 0.60000000000j,
+    "01100101": +0.86666666667 + 0.73333333333j,
+    "01100110": +0.86666666667 + 0.86666666667j,
+    "01100111": +0.86666666667 + 1.00000000000j,
+    "01101000": +0.86666666667 - 1.00000000000j,
+    "01101001": +0.86666666667 - 0.86666666667j,
+    "01101010": +0.86666666667 - 0.73333333333j,
+    "01101011": +0.86666666667 - 0.60000000000j,
+    "01101100": +0.86666666667 - 0.46666666667j,
+    "01101101": +0.86666666667 - 0.33333333333j,
+    "01101110": +0.86666666667 - 0.20000000000j,
+    "01101111": +0.86666666667 - 0.06666666667j,
+    "01110000": +1.00000000000 + 0.06666666667j,
+    "01110001": +1.00000000000 + 0.20000000000j,
+    "01110010": +1.00000000000 + 0.33333333333j,
+    "01110011": +1.00000000000 + 0.46666666667j,
+    "01110100": +1.00000000000 + 0.60000000000j,
+    "01110101": +1.00000000000 + 0.73333333333j,
+    "01110110": +1.00000000000 + 0.86666666667j,
+    "01110111": +1.00000000000 + 1.00000000000j,
+    "01111000": +1.00000000000 - 1.00000000000j,
+    "01111001": +1.00000000000 - 0.86666666667j,
+    "01111010": +1.00000000000 - 0.73333333333j,
+    "01111011": +1.00000000000 - 0.60000000000j,
+    "01111100": +1.00000000000 - 0.46666666667j,
+    "01111101": +1.00000000000 - 0.33333333333j,
+    "01111110": +1.00000000000 - 0.20000000000j,
+    "01111111": +1.00000000000 - 0.06666666667j,
+    "10000000": -1.00000000000 + 0.06666666667j,
+    "10000001": -1.00000000000 + 0.20000000000j,
+    "10000010": -1.00000000000 + 0.33333333333j,
+    "10000011": -1.00000000000 + 0.46666666667j,
+    "10000100": -1.00000000000 + 0.60000000000j,
+    "10000101": -1.00000000000 + 0.73333333333j,
+    "10000110": -1.00000000000 + 0.86666666667j,
+    "10000111": -1.00000000000 + 1.00000000000j,
+    "10001000": -1.00000000000 - 1.00000000000j,
+    "10001001": -1.00000000000 - 0.86666666667j,
+    "10001010": -1.00000000000 - 0.73333333333j,
+    "10001011": -1.00000000000 - 0.60000000000j,
+    "10001100": -1.00000000000 - 0.46666666667j,
+    "10001101": -1.00000000000 - 0.33333333333j,
+    "10001110": -1.00000000000 - 0.20000000000j,
+    "10001111": -1.00000000000 - 0.06666666667j,
+    "10010000": -0.86666666667 + 0.06666666667j,
+    "10010001": -0.86666666667 + 0.20000000000j,
+    "10010010": -0.86666666667 + 0.33333333333j,
+    "10010011": -0.86666666667 + 0.46666666667j,
+    "10010100": -0.86666666667 + 0.60000000000j,
+    "10010101": -0.86666666667 + 0.73333333333j,
+    "10010110": -0.86666666667 + 0.86666666667j,
+    "10010111": -0.86666666667 + 1.00000000000j,
+    "10011000": -0.86666666667 - 1.00000000000j,
+    "10011001": -0.86666666667 - 0.86666666667j,
+    "10011010": -0.86666666667 - 0.73333333333j,
+    "10011011": -0.86666666667 - 0.60000000000j,
+    "10011100": -0.86666666667 - 0.46666666667j,
+    "10011101": -0.86666666667 - 0.33333333333j,
+    "10011110": -0.86666666667 - 0.20000000000j,
+    "10011111": -0.86666666667 - 0.06666666667j,
+    "10100000": -0.73333333333 + 0.06666666667j,
+    "10100001": -0.73333333333 + 0.20000000000j,
+    "10100010": -0.73333333333 + 0.33333333333j,
+    "10100011": -0.73333333333 + 0.46666666667j,
+    "10100100": -0.73333333333 + 0.60000000000j,
+    "10100101": -0.73333333333 + 0.73333333333j,
+    "10100110": -0.73333333333 + 0.86666666667j,
+    "10100111": -0.73333333333 + 1.00000000000j,
+    "10101000": -0.73333333333 - 1.00000000000j,
+    "10101001": -0.73333333333 - 0.86666666667j,
+    "10101010": -0.73333333333 - 0.73333333333j,
+    "10101011": -0.73333333333 - 0.60000000000j,
+    "10101100": -0.73333333333 - 0.46666666667j,
+    "10101101": -0.73333333333 - 0.33333333333j,
+    "10101110": -0.73333333333 - 0.20000000000j,
+    "10101111": -0.73333333333 - 0.06666666667j,
+    "10110000": -0.60000000000 + 0.06666666667j,
+    "10110001": -0.60000000000 + 0.20000000000j,
+    "10110010": -0.60000000000 + 0.33333333333j,
+    "10110011": -0.60000000000 + 0.46666666667j,
+    "10110100": -0.60000000000 + 0.60000000000j,
+    "10110101": -0.60000000000 + 0.73333333333j,
+    "10110110": -0.60000000000 + 0.86666666667j,
+    "10110111": -0.60000000000 + 1.00000000000j,
+    "10111000": -0.60000000000 - 1.00000000000j,
+    "10111001": -0.60000000000 - 0.86666666667j,
+    "10111010": -0.60000000000 - 0.73333333333j,
+    "10111011": -0.60000000000 - 0.60000000000j,
+    "10111100": -0.60000000000 - 0.46666666667j,
+    "10111101": -0.60000000000 - 0.33333333333j,
+    "10111110": -0.60000000000 - 0.20000000000j,
+    "10111111": -0.60000000000 - 0.06666666667j,
+    "11000000": -0.46666666667 + 0.06666666667j,
+    "11000001": -0.46666666667 + 0.20000000000j,
+    "11000010": -0.46666666667 + 0.33333333333j,
+    "11000011": -0.46666666667 + 0.46666666667j,
+    "11000100": -0.46666666667 + 0.60000000000j,
+    "11000101": -0.46666666667 + 0.73333333333j,
+    "11000110": -0.46666666667 + 0.86666666667j,
+    "11000111": -0.46666666667 + 1.00000000000j,
+    "11001000": -0.46666666667 - 1.00000000000j,
+    "11001001": -0.46666666667 - 0.86666666667j,
+    "11001010": -0.46666666667 - 0.73333333333j,
+    "11001011": -0.46666666667 - 0.60000000000j,
+    "11001100": -0.46666666667 - 0.46666666667j,
+    "11001101": -0.46666666667 - 0.33333333333j,
+    "11001110": -0.46666666667 - 0.20000000000j,
+    "11001111": -0.46666666667 - 0.06666666667j,
+    "11010000": -0.33333333333 + 0.06666666667j,
+    "11010001": -0.33333333333 + 0.20000000000j,
+    "11010010": -0.33333333333 + 0.33333333333j,
+    "11010011": -0.33333333333 + 0.46666666667j,
+    "11010100": -0.33333333333 + 0.60000000000j,
+    "11010101": -0.33333333333 + 0.73333333333j,
+    "11010110": -0.33333333333 + 0.86666666667j,
+    "11010111": -0.33333333333 + 1.00000000000j,
+    "11011000": -0.33333333333 - 1.00000000000j,
+    "11011001": -0.33333333333 - 0.86666666667j,
+    "11011010": -0.33333333333 - 0.73333333333j,
+    "11011011": -0.33333333333 - 0.60000000000j,
+    "11011100": -0.33333333333 - 0.46666666667j,
+    "11011101": -0.33333333333 - 0.33333333333j,
+    "11011110": -0.33333333333 - 0.20000000000j,
+    "11011111": -0.33333333333 - 0.06666666667j,
+    "11100000": -0.20000000000 + 0.06666666667j,
+    "11100001": -0.20000000000 + 0.20000000000j,
+    "11100010": -0.20000000000 + 0.33333333333j,
+    "11100011": -0.20000000000 + 0.46666666667j,
+    "11100100": -0.20000000000 + 0.60000000000j,
+    "11100101": -0.20000000000 + 0.73333333333j,
+    "11100110": -0.20000000000 + 0.86666666667j,
+    "11100111": -0.20000000000 + 1.00000000000j,
+    "11101000": -0.20000000000 - 1.00000000000j,
+    "11101001": -0.20000000000 - 0.86666666667j,
+    "11101010": -0.20000000000 - 0.73333333333j,
+    "11101011": -0.20000000000 - 0.60000000000j,
+    "11101100": -0.20000000000 - 0.46666666667j,
+    "11101101": -0.20000000000 - 0.33333333333j,
+    "11101110": -0.20000000000 - 0.20000000000j,
+    "11101111": -0.20000000000 - 0.06666666667j,
+    "11110000": -0.06666666667 + 0.06666666667j,
+    "11110001": -0.06666666667 + 0.20000000000j,
+    "11110010": -0.06666666667 + 0.33333333333j,
+    "11110011": -0.06666666667 + 0.46666666667j,
+    "11110100": -0.06666666667 + 0.60000000000j,
+    "11110101": -0.06666666667 + 0.73333333333j,
+    "11110110": -0.06666666667 + 0.86666666667j,
+    "11110111": -0.06666666667 + 1.00000000000j,
+    "11111000": -0.06666666667 - 1.00000000000j,
+    "11111001": -0.06666666667 - 0.86666666667j,
+    "11111010": -0.06666666667 - 0.73333333333j,
+    "11111011": -0.06666666667 - 0.60000000000j,
+    "11111100": -0.06666666667 - 0.46666666667j,
+    "11111101": -0.06666666667 - 0.33333333333j,
+    "11111110": -0.06666666667 - 0.20000000000j,
+    "11111111": -0.06666666667 - 0.06666666667j,
+})
+qam256Lut = symbol_map_to_lut(qam256Map, 8, "256 QAM")
+qam256Lut.setflags(write=False)
 
 
 def qam256_modulator(data, customMap=None):
-    """Converts list of bits to symbol values as strings, maps each
+    """Converts list of bits to integer symbol values, maps each
     symbol value to a position on the complex plane, and returns an
-    array of complex values for 256 QAM.
+    array of complex64 values for 256 QAM.
 
     An 8-variable Karnaugh map is used to determine the default symbol
     locations to prevent adjacent symbol errors from differing more
@@ -1527,288 +1834,16 @@ def qam256_modulator(data, customMap=None):
 
     customMap is a dict whos keys are strings containing the symbol's
     binary value and whos values are the symbol's location in the
-    complex plane.
+    complex plane. Every possible symbol value must be included.
     e.g. customMap = {'0101': 0.707 + 0.707j, ...}"""
 
-    pattern = [
-        str(d0) + str(d1) + str(d2) + str(d3) + str(d4) + str(d5) + str(d6) + str(d7)
-        for d0, d1, d2, d3, d4, d5, d6, d7 in zip(
-            data[0::8],
-            data[1::8],
-            data[2::8],
-            data[3::8],
-            data[4::8],
-            data[5::8],
-            data[6::8],
-            data[7::8],
-        )
-    ]
+    symbols = bits_to_symbols(data, 8)
     if customMap:
-        qamMap = customMap
+        lut = symbol_map_to_lut(customMap, 8, "256 QAM")
     else:
-        qamMap = {
-            "00000000": +0.06666666667 + 0.06666666667j,
-            "00000001": +0.06666666667 + 0.20000000000j,
-            "00000010": +0.06666666667 + 0.33333333333j,
-            "00000011": +0.06666666667 + 0.46666666667j,
-            "00000100": +0.06666666667 + 0.60000000000j,
-            "00000101": +0.06666666667 + 0.73333333333j,
-            "00000110": +0.06666666667 + 0.86666666667j,
-            "00000111": +0.06666666667 + 1.00000000000j,
-            "00001000": +0.06666666667 - 1.00000000000j,
-            "00001001": +0.06666666667 - 0.86666666667j,
-            "00001010": +0.06666666667 - 0.73333333333j,
-            "00001011": +0.06666666667 - 0.60000000000j,
-            "00001100": +0.06666666667 - 0.46666666667j,
-            "00001101": +0.06666666667 - 0.33333333333j,
-            "00001110": +0.06666666667 - 0.20000000000j,
-            "00001111": +0.06666666667 - 0.06666666667j,
-            "00010000": +0.20000000000 + 0.06666666667j,
-            "00010001": +0.20000000000 + 0.20000000000j,
-            "00010010": +0.20000000000 + 0.33333333333j,
-            "00010011": +0.20000000000 + 0.46666666667j,
-            "00010100": +0.20000000000 + 0.60000000000j,
-            "00010101": +0.20000000000 + 0.73333333333j,
-            "00010110": +0.20000000000 + 0.86666666667j,
-            "00010111": +0.20000000000 + 1.00000000000j,
-            "00011000": +0.20000000000 - 1.00000000000j,
-            "00011001": +0.20000000000 - 0.86666666667j,
-            "00011010": +0.20000000000 - 0.73333333333j,
-            "00011011": +0.20000000000 - 0.60000000000j,
-            "00011100": +0.20000000000 - 0.46666666667j,
-            "00011101": +0.20000000000 - 0.33333333333j,
-            "00011110": +0.20000000000 - 0.20000000000j,
-            "00011111": +0.20000000000 - 0.06666666667j,
-            "00100000": +0.33333333333 + 0.06666666667j,
-            "00100001": +0.33333333333 + 0.20000000000j,
-            "00100010": +0.33333333333 + 0.33333333333j,
-            "00100011": +0.33333333333 + 0.46666666667j,
-            "00100100": +0.33333333333 + 0.60000000000j,
-            "00100101": +0.33333333333 + 0.73333333333j,
-            "00100110": +0.33333333333 + 0.86666666667j,
-            "00100111": +0.33333333333 + 1.00000000000j,
-            "00101000": +0.33333333333 - 1.00000000000j,
-            "00101001": +0.33333333333 - 0.86666666667j,
-            "00101010": +0.33333333333 - 0.73333333333j,
-            "00101011": +0.33333333333 - 0.60000000000j,
-            "00101100": +0.33333333333 - 0.46666666667j,
-            "00101101": +0.33333333333 - 0.33333333333j,
-            "00101110": +0.33333333333 - 0.20000000000j,
-            "00101111": +0.33333333333 - 0.06666666667j,
-            "00110000": +0.46666666667 + 0.06666666667j,
-            "00110001": +0.46666666667 + 0.20000000000j,
-            "00110010": +0.46666666667 + 0.33333333333j,
-            "00110011": +0.46666666667 + 0.46666666667j,
-            "00110100": +0.46666666667 + 0.60000000000j,
-            "00110101": +0.46666666667 + 0.73333333333j,
-            "00110110": +0.46666666667 + 0.86666666667j,
-            "00110111": +0.46666666667 + 1.00000000000j,
-            "00111000": +0.46666666667 - 1.00000000000j,
-            "00111001": +0.46666666667 - 0.86666666667j,
-            "00111010": +0.46666666667 - 0.73333333333j,
-            "00111011": +0.46666666667 - 0.60000000000j,
-            "00111100": +0.46666666667 - 0.46666666667j,
-            "00111101": +0.46666666667 - 0.33333333333j,
-            "00111110": +0.46666666667 - 0.20000000000j,
-            "00111111": +0.46666666667 - 0.06666666667j,
-            "01000000": +0.60000000000 + 0.06666666667j,
-            "01000001": +0.60000000000 + 0.20000000000j,
-            "01000010": +0.60000000000 + 0.33333333333j,
-            "01000011": +0.60000000000 + 0.46666666667j,
-            "01000100": +0.60000000000 + 0.60000000000j,
-            "01000101": +0.60000000000 + 0.73333333333j,
-            "01000110": +0.60000000000 + 0.86666666667j,
-            "01000111": +0.60000000000 + 1.00000000000j,
-            "01001000": +0.60000000000 - 1.00000000000j,
-            "01001001": +0.60000000000 - 0.86666666667j,
-            "01001010": +0.60000000000 - 0.73333333333j,
-            "01001011": +0.60000000000 - 0.60000000000j,
-            "01001100": +0.60000000000 - 0.46666666667j,
-            "01001101": +0.60000000000 - 0.33333333333j,
-            "01001110": +0.60000000000 - 0.20000000000j,
-            "01001111": +0.60000000000 - 0.06666666667j,
-            "01010000": +0.73333333333 + 0.06666666667j,
-            "01010001": +0.73333333333 + 0.20000000000j,
-            "01010010": +0.73333333333 + 0.33333333333j,
-            "01010011": +0.73333333333 + 0.46666666667j,
-            "01010100": +0.73333333333 + 0.60000000000j,
-            "01010101": +0.73333333333 + 0.73333333333j,
-            "01010110": +0.73333333333 + 0.86666666667j,
-            "01010111": +0.73333333333 + 1.00000000000j,
-            "01011000": +0.73333333333 - 1.00000000000j,
-            "01011001": +0.73333333333 - 0.86666666667j,
-            "01011010": +0.73333333333 - 0.73333333333j,
-            "01011011": +0.73333333333 - 0.60000000000j,
-            "01011100": +0.73333333333 - 0.46666666667j,
-            "01011101": +0.73333333333 - 0.33333333333j,
-            "01011110": +0.73333333333 - 0.20000000000j,
-            "01011111": +0.73333333333 - 0.06666666667j,
-            "01100000": +0.86666666667 + 0.06666666667j,
-            "01100001": +0.86666666667 + 0.20000000000j,
-            "01100010": +0.86666666667 + 0.33333333333j,
-            "01100011": +0.86666666667 + 0.46666666667j,
-            "01100100": +0.86666666667 + 0.60000000000j,
-            "01100101": +0.86666666667 + 0.73333333333j,
-            "01100110": +0.86666666667 + 0.86666666667j,
-            "01100111": +0.86666666667 + 1.00000000000j,
-            "01101000": +0.86666666667 - 1.00000000000j,
-            "01101001": +0.86666666667 - 0.86666666667j,
-            "01101010": +0.86666666667 - 0.73333333333j,
-            "01101011": +0.86666666667 - 0.60000000000j,
-            "01101100": +0.86666666667 - 0.46666666667j,
-            "01101101": +0.86666666667 - 0.33333333333j,
-            "01101110": +0.86666666667 - 0.20000000000j,
-            "01101111": +0.86666666667 - 0.06666666667j,
-            "01110000": +1.00000000000 + 0.06666666667j,
-            "01110001": +1.00000000000 + 0.20000000000j,
-            "01110010": +1.00000000000 + 0.33333333333j,
-            "01110011": +1.00000000000 + 0.46666666667j,
-            "01110100": +1.00000000000 + 0.60000000000j,
-            "01110101": +1.00000000000 + 0.73333333333j,
-            "01110110": +1.00000000000 + 0.86666666667j,
-            "01110111": +1.00000000000 + 1.00000000000j,
-            "01111000": +1.00000000000 - 1.00000000000j,
-            "01111001": +1.00000000000 - 0.86666666667j,
-            "01111010": +1.00000000000 - 0.73333333333j,
-            "01111011": +1.00000000000 - 0.60000000000j,
-            "01111100": +1.00000000000 - 0.46666666667j,
-            "01111101": +1.00000000000 - 0.33333333333j,
-            "01111110": +1.00000000000 - 0.20000000000j,
-            "01111111": +1.00000000000 - 0.06666666667j,
-            "10000000": -1.00000000000 + 0.06666666667j,
-            "10000001": -1.00000000000 + 0.20000000000j,
-            "10000010": -1.00000000000 + 0.33333333333j,
-            "10000011": -1.00000000000 + 0.46666666667j,
-            "10000100": -1.00000000000 + 0.60000000000j,
-            "10000101": -1.00000000000 + 0.73333333333j,
-            "10000110": -1.00000000000 + 0.86666666667j,
-            "10000111": -1.00000000000 + 1.00000000000j,
-            "10001000": -1.00000000000 - 1.00000000000j,
-            "10001001": -1.00000000000 - 0.86666666667j,
-            "10001010": -1.00000000000 - 0.73333333333j,
-            "10001011": -1.00000000000 - 0.60000000000j,
-            "10001100": -1.00000000000 - 0.46666666667j,
-            "10001101": -1.00000000000 - 0.33333333333j,
-            "10001110": -1.00000000000 - 0.20000000000j,
-            "10001111": -1.00000000000 - 0.06666666667j,
-            "10010000": -0.86666666667 + 0.06666666667j,
-            "10010001": -0.86666666667 + 0.20000000000j,
-            "10010010": -0.86666666667 + 0.33333333333j,
-            "10010011": -0.86666666667 + 0.46666666667j,
-            "10010100": -0.86666666667 + 0.60000000000j,
-            "10010101": -0.86666666667 + 0.73333333333j,
-            "10010110": -0.86666666667 + 0.86666666667j,
-            "10010111": -0.86666666667 + 1.00000000000j,
-            "10011000": -0.86666666667 - 1.00000000000j,
-            "10011001": -0.86666666667 - 0.86666666667j,
-            "10011010": -0.86666666667 - 0.73333333333j,
-            "10011011": -0.86666666667 - 0.60000000000j,
-            "10011100": -0.86666666667 - 0.46666666667j,
-            "10011101": -0.86666666667 - 0.33333333333j,
-            "10011110": -0.86666666667 - 0.20000000000j,
-            "10011111": -0.86666666667 - 0.06666666667j,
-            "10100000": -0.73333333333 + 0.06666666667j,
-            "10100001": -0.73333333333 + 0.20000000000j,
-            "10100010": -0.73333333333 + 0.33333333333j,
-            "10100011": -0.73333333333 + 0.46666666667j,
-            "10100100": -0.73333333333 + 0.60000000000j,
-            "10100101": -0.73333333333 + 0.73333333333j,
-            "10100110": -0.73333333333 + 0.86666666667j,
-            "10100111": -0.73333333333 + 1.00000000000j,
-            "10101000": -0.73333333333 - 1.00000000000j,
-            "10101001": -0.73333333333 - 0.86666666667j,
-            "10101010": -0.73333333333 - 0.73333333333j,
-            "10101011": -0.73333333333 - 0.60000000000j,
-            "10101100": -0.73333333333 - 0.46666666667j,
-            "10101101": -0.73333333333 - 0.33333333333j,
-            "10101110": -0.73333333333 - 0.20000000000j,
-            "10101111": -0.73333333333 - 0.06666666667j,
-            "10110000": -0.60000000000 + 0.06666666667j,
-            "10110001": -0.60000000000 + 0.20000000000j,
-            "10110010": -0.60000000000 + 0.33333333333j,
-            "10110011": -0.60000000000 + 0.46666666667j,
-            "10110100": -0.60000000000 + 0.60000000000j,
-            "10110101": -0.60000000000 + 0.73333333333j,
-            "10110110": -0.60000000000 + 0.86666666667j,
-            "10110111": -0.60000000000 + 1.00000000000j,
-            "10111000": -0.60000000000 - 1.00000000000j,
-            "10111001": -0.60000000000 - 0.86666666667j,
-            "10111010": -0.60000000000 - 0.73333333333j,
-            "10111011": -0.60000000000 - 0.60000000000j,
-            "10111100": -0.60000000000 - 0.46666666667j,
-            "10111101": -0.60000000000 - 0.33333333333j,
-            "10111110": -0.60000000000 - 0.20000000000j,
-            "10111111": -0.60000000000 - 0.06666666667j,
-            "11000000": -0.46666666667 + 0.06666666667j,
-            "11000001": -0.46666666667 + 0.20000000000j,
-            "11000010": -0.46666666667 + 0.33333333333j,
-            "11000011": -0.46666666667 + 0.46666666667j,
-            "11000100": -0.46666666667 + 0.60000000000j,
-            "11000101": -0.46666666667 + 0.73333333333j,
-            "11000110": -0.46666666667 + 0.86666666667j,
-            "11000111": -0.46666666667 + 1.00000000000j,
-            "11001000": -0.46666666667 - 1.00000000000j,
-            "11001001": -0.46666666667 - 0.86666666667j,
-            "11001010": -0.46666666667 - 0.73333333333j,
-            "11001011": -0.46666666667 - 0.60000000000j,
-            "11001100": -0.46666666667 - 0.46666666667j,
-            "11001101": -0.46666666667 - 0.33333333333j,
-            "11001110": -0.46666666667 - 0.20000000000j,
-            "11001111": -0.46666666667 - 0.06666666667j,
-            "11010000": -0.33333333333 + 0.06666666667j,
-            "11010001": -0.33333333333 + 0.20000000000j,
-            "11010010": -0.33333333333 + 0.33333333333j,
-            "11010011": -0.33333333333 + 0.46666666667j,
-            "11010100": -0.33333333333 + 0.60000000000j,
-            "11010101": -0.33333333333 + 0.73333333333j,
-            "11010110": -0.33333333333 + 0.86666666667j,
-            "11010111": -0.33333333333 + 1.00000000000j,
-            "11011000": -0.33333333333 - 1.00000000000j,
-            "11011001": -0.33333333333 - 0.86666666667j,
-            "11011010": -0.33333333333 - 0.73333333333j,
-            "11011011": -0.33333333333 - 0.60000000000j,
-            "11011100": -0.33333333333 - 0.46666666667j,
-            "11011101": -0.33333333333 - 0.33333333333j,
-            "11011110": -0.33333333333 - 0.20000000000j,
-            "11011111": -0.33333333333 - 0.06666666667j,
-            "11100000": -0.20000000000 + 0.06666666667j,
-            "11100001": -0.20000000000 + 0.20000000000j,
-            "11100010": -0.20000000000 + 0.33333333333j,
-            "11100011": -0.20000000000 + 0.46666666667j,
-            "11100100": -0.20000000000 + 0.60000000000j,
-            "11100101": -0.20000000000 + 0.73333333333j,
-            "11100110": -0.20000000000 + 0.86666666667j,
-            "11100111": -0.20000000000 + 1.00000000000j,
-            "11101000": -0.20000000000 - 1.00000000000j,
-            "11101001": -0.20000000000 - 0.86666666667j,
-            "11101010": -0.20000000000 - 0.73333333333j,
-            "11101011": -0.20000000000 - 0.60000000000j,
-            "11101100": -0.20000000000 - 0.46666666667j,
-            "11101101": -0.20000000000 - 0.33333333333j,
-            "11101110": -0.20000000000 - 0.20000000000j,
-            "11101111": -0.20000000000 - 0.06666666667j,
-            "11110000": -0.06666666667 + 0.06666666667j,
-            "11110001": -0.06666666667 + 0.20000000000j,
-            "11110010": -0.06666666667 + 0.33333333333j,
-            "11110011": -0.06666666667 + 0.46666666667j,
-            "11110100": -0.06666666667 + 0.60000000000j,
-            "11110101": -0.06666666667 + 0.73333333333j,
-            "11110110": -0.06666666667 + 0.86666666667j,
-            "11110111": -0.06666666667 + 1.00000000000j,
-            "11111000": -0.06666666667 - 1.00000000000j,
-            "11111001": -0.06666666667 - 0.86666666667j,
-            "11111010": -0.06666666667 - 0.73333333333j,
-            "11111011": -0.06666666667 - 0.60000000000j,
-            "11111100": -0.06666666667 - 0.46666666667j,
-            "11111101": -0.06666666667 - 0.33333333333j,
-            "11111110": -0.06666666667 - 0.20000000000j,
-            "11111111": -0.06666666667 - 0.06666666667j,
-        }
+        lut = qam256Lut
 
-    try:
-        return np.array([qamMap[p] for p in pattern])
-    except KeyError:
-        raise ValueError("Invalid 256 QAM symbol.")
+    return np.take(lut, symbols)
 
 
 def digmod_prbs_generator(
@@ -1846,6 +1881,51 @@ def digmod_prbs_generator(
     )
 
 
+@lru_cache(maxsize=32)
+def pulse_shaping_filter(filt, alpha, taps, osFactor, up=1, down=1):
+    """
+    HELPER FUNCTION
+    Creates the pulse shaping filter used by digmod_generator. If up and down
+    are given, the low pass filter resample_poly() would use to resample the
+    pulse shaped signal by up/down is folded in, so pulse shaping and final
+    resampling can be done in a single upfirdn() call. Filters are cached by
+    their parameters, so repeated calls with the same settings skip the
+    filter design entirely.
+    Args:
+        filt (str): Pulse shaping filter type. ('raisedcosine' or 'rootraisedcosine')
+        alpha (float): Pulse shaping filter excess bandwidth specification.
+        taps (int): Number of filter taps.
+        osFactor (int): Oversampling factor.
+        up (int): Interpolation factor of the final resampling.
+        down (int): Decimation factor of the final resampling.
+
+    Returns:
+        (NumPy array): Read-only float32 filter coefficients at osFactor * up samples per symbol.
+        (int): Index of the center of the filter.
+    """
+
+    if filt == "rootraisedcosine":
+        psFilter = rrc_filter(alpha, taps, osFactor)
+    elif filt == "raisedcosine":
+        psFilter = rc_filter(alpha, taps, osFactor)
+    else:
+        raise error.WfmBuilderError("Invalid pulse shaping filter chosen. Use 'raisedcosine' or 'rootraisedcosine'")
+
+    center = (len(psFilter) - 1) // 2 * up
+    if up != 1 or down != 1:
+        # Same filter resample_poly() designs for window=("kaiser", 11), convolved with the upsampled pulse shaping filter
+        halfLen = 10 * max(up, down)
+        lpFilter = sig.firwin(2 * halfLen + 1, 1 / max(up, down), window=("kaiser", 11)) * up
+        psFilter = sig.upfirdn(lpFilter, psFilter, up=up)
+        center += halfLen
+
+    # Single precision is plenty for the DAC and keeps the filtering and resampling in complex64
+    psFilter = psFilter.astype(np.float32)
+    # The same array is handed out on every cache hit, so don't let anyone modify it
+    psFilter.setflags(write=False)
+    return psFilter, center
+
+
 def digmod_generator(
     fs=10,
     symRate=1,
@@ -1876,7 +1956,8 @@ def digmod_generator(
         plot (bool): Enable or disable plotting of final waveform in time domain and constellation domain.
 
     Returns:
-        (NumPy array): Array containing the complex values of the waveform.
+        (NumPy array): Array containing the complex64 values of the waveform. Single precision
+            rounding can move a scaled 16 bit DAC sample by 1 LSB compared to a complex128 waveform.
 
     TODO
         Add an argument that allows user to specify symbol data.
@@ -1961,77 +2042,68 @@ def digmod_generator(
     else:
         raise ValueError("Invalid modType chosen.")
 
-    # Create random bit pattern
-    bits = np.random.randint(0, 2, bitsPerSym * numSymbols)
-    # tempBits = bits
-    # repeats = 1
-    # while len(bits) % bitsPerSym:
-    #     bits = np.tile(tempBits, repeats)
-    #     repeats += 1
+    # Create random bit pattern. Exactly bitsPerSym * numSymbols bits are drawn, so the
+    # pattern never needs to be tiled out to a whole number of symbols.
+    bits = np.random.randint(0, 2, bitsPerSym * numSymbols, dtype=np.uint8)
 
     # Group the bits into symbol values and then map the symbols to locations in the complex plane.
     modulatedValues = modulator(bits)
-
-    # Zero-pad symbols to satisfy oversampling factor and provide impulse-like response for better pulse shaping performance.
-    rawSymbols = np.zeros(len(modulatedValues) * intermediateOsFactor, dtype=complex)
-    rawSymbols[::intermediateOsFactor] = modulatedValues
+    # The bits aren't needed anymore, release them rather than holding them for the rest of the function
+    del bits
 
     # Create pulse shaping filter
     # The number of taps required must be a multiple of the oversampling factor
     taps = 4 * intermediateOsFactor
 
-    if filt.lower() == "rootraisedcosine":
-        psFilter = rrc_filter(alpha, taps, intermediateOsFactor)
-    elif filt.lower() == "raisedcosine":
-        psFilter = rc_filter(alpha, taps, intermediateOsFactor)
+    # If the final sample rate is no higher than the intermediate rate, fold the final resampling into the pulse
+    # shaping filter and do both in one polyphase step. Otherwise filtering at the final rate costs more than
+    # resampling separately.
+    if finalOsNum <= finalOsDenom:
+        up, down = finalOsNum, finalOsDenom
     else:
-        raise error.WfmBuilderError("Invalid pulse shaping filter chosen. Use 'raisedcosine' or 'rootraisedcosine'")
+        up, down = 1, 1
+    psFilter, center = pulse_shaping_filter(filt.lower(), alpha, taps, intermediateOsFactor, up, down)
 
-    """There are several considerations here."""
     # At the beginning and the end of convolution, the two arrays don't
-    # fully overlap, which results in invalid data. We don't want to
-    # keep that data, so we're prepending the end of the signal onto
-    # the beginning and append the beginning onto the end to provide
-    # "runway" for the convolution. We will be throwing this prepended
-    # and appended data away at the end of the signal creation process.
-    #
-    # In order to eliminate wraparound issues, we need to ensure that
-    # the prepended and appended segments will be an integer number of
-    # samples AFTER final resampling. The extra segments must also
-    # be at least as long as the pulse shaping filter so that we have
-    # enough runway to get all the invalid samples out before getting
-    # into the meat of the waveform.
-
-    # Determine wraparound location
-    wrapLocation = finalOsDenom
-    # Make sure it's at least as long as the pulse shaping filter
-    while wrapLocation < taps:
-        wrapLocation *= 2
-
-    # Prepend and append
-    rawSymbols = np.concatenate([rawSymbols[-wrapLocation:], rawSymbols, rawSymbols[:wrapLocation]])
-
-    # Apply pulse shaping filter to symbols via convolution
-    filteredSymbols = np.convolve(rawSymbols, psFilter, mode="same")
-
-    # Perform the final resampling AND filter out images using a single SciPy function
-    iq = sig.resample_poly(filteredSymbols, finalOsNum, finalOsDenom, window=("kaiser", 11))
-
-    # Calculate location of final prepended and appended segments
-    finalWrapLocation = wrapLocation * finalOsNum / finalOsDenom
-    if finalWrapLocation.is_integer():
-        finalWrapLocation = int(finalWrapLocation)
-    else:
-        raise error.WfmBuilderError(
-            "Signal does not meet conditions for wraparound mitigation, choose sample rate so that it is an integer multiple of symbol rate."
-        )
+    # fully overlap, which results in invalid data. The waveform is
+    # played back in a loop, so the end of the signal really precedes
+    # its beginning and the filtering should be circular. Both upfirdn()
+    # and resample_poly() can extend their input periodically ("wrap"
+    # mode), which gives exactly that without prepending the end of the
+    # signal onto the beginning and appending the beginning onto the
+    # end to provide "runway" for the convolution, and without throwing
+    # that runway away again afterward.
+
+    # Zero-pad and apply pulse shaping filter in a single polyphase step, which skips all the multiplications by zero
+    # and, when decimating, all the samples that would be thrown away. The filter is zero-padded at the front so
+    # that an output sample lands exactly on the first symbol.
+    prePad = -center % down
+    filteredSymbols = sig.upfirdn(
+        np.pad(psFilter, (prePad, 0)), modulatedValues, up=intermediateOsFactor * up, down=down, mode="wrap"
+    )
+
+    # Line the result up with the 'same' mode convolution of the zero-padded signal, keeping exactly one period
+    start = (center + prePad) // down
+    filteredSymbols = filteredSymbols[start : start + len(modulatedValues) * intermediateOsFactor * up // down]
 
-    # Trim off prepended and appended segments
-    iq = iq[finalWrapLocation:-finalWrapLocation]
+    if (up, down) != (finalOsNum, finalOsDenom):
+        # Perform the final resampling AND filter out images using a single SciPy function
+        iq = sig.resample_poly(filteredSymbols, finalOsNum, finalOsDenom, window=("kaiser", 11), padtype="wrap")
+    else:
+        iq = filteredSymbols
+    del filteredSymbols
 
     # Scale signal to prevent compressing iq modulator
-    sFactor = abs(np.amax(iq))
-    iq = iq / sFactor * 0.707
+    # np.amax() on a complex array returns the value with the largest real part, not the largest magnitude.
+    # Magnitudes are computed a block at a time into one small scratch buffer that stays in cache rather
+    # than into a temporary array as long as the waveform.
+    blockSize = 2 ** 16
+    scratch = np.empty(blockSize, dtype=iq.real.dtype)
+    peak = 0.0
+    for blockStart in range(0, len(iq), blockSize):
+        block = iq[blockStart : blockStart + blockSize]
+        peak = max(peak, np.abs(block, out=scratch[: len(block)]).max())
+    iq *= 0.707 / peak
 
     # Zero the last sample if needed
     if zeroLast:
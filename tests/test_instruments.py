@@ -0,0 +1,151 @@
+import numpy as np
+import pytest
+import socketscpi
+
+from pyarbtools import error, instruments
+
+
+class StubInstrument:
+    """Stands in for a socketscpi/PyVISA connection and records everything sent to it."""
+
+    def __init__(self, catalog="1,1000,2,1000", compound=True):
+        self.catalog = catalog
+        self.compound = compound
+        self.errors = []
+        self.fail = None
+        self.log = []
+
+    def write(self, cmd):
+        self.log.append(cmd)
+        if self.fail and self.fail in cmd:
+            raise socketscpi.SockInstError(["-222"])
+
+    def write_binary_values(self, cmd, data, datatype="b"):
+        self.log.append(cmd)
+
+    def query(self, cmd):
+        self.log.append(cmd)
+        if cmd == "SYST:ERR?":
+            return self.errors.pop(0) if self.errors else '+0,"No error"\n'
+        if "catalog?" in cmd:
+            return self.catalog + "\n"
+        queries = cmd.split(";:")
+        if len(queries) > 1 and self.compound is not True:
+            if isinstance(self.compound, Exception):
+                raise self.compound
+            # Instrument only answers the first query of the compound query
+            queries = queries[:1]
+        return ";".join(q.upper() for q in queries) + "\n"
+
+
+def make_awg(**kwargs):
+    """Builds an M8195A around a stub instrument without connecting to anything."""
+    awg = instruments.M8195A.__new__(instruments.M8195A)
+    awg.instance = StubInstrument(**kwargs)
+    awg.apiType = "socketscpi"
+    awg.wfmBuffer = None
+    awg.nextSegment = {}
+    awg.gran = 256
+    awg.minLen = 1280
+    awg.binMult = 127
+    awg.binShift = 0
+    return awg
+
+
+@pytest.mark.parametrize("wfmDtype", [np.float64, np.float32])
+@pytest.mark.parametrize("dtype, binMult, binShift", [(np.int16, 2047, 4), (np.int16, 32767, 0), (np.int8, 127, 0)])
+def test_wfm_scaler_serial_and_threaded_match(monkeypatch, wfmDtype, dtype, binMult, binShift):
+    wfm = np.random.default_rng(0).uniform(-1, 1, 3 * 2 ** 20 + 5).astype(wfmDtype)
+    expected = np.array(binMult * wfm, dtype=dtype) << binShift
+
+    monkeypatch.setattr(instruments.os, "cpu_count", lambda: 1)
+    serial = instruments.wfm_scaler(wfm, binMult, binShift, dtype=dtype)
+    monkeypatch.setattr(instruments.os, "cpu_count", lambda: 4)
+    threaded = instruments.wfm_scaler(wfm, binMult, binShift, dtype=dtype, out=np.empty(len(wfm), dtype=dtype))
+
+    assert serial.dtype == threaded.dtype == dtype
+    np.testing.assert_array_equal(serial, expected)
+    np.testing.assert_array_equal(threaded, expected)
+
+
+def test_query_multiple_single_round_trip():
+    awg = make_awg()
+
+    assert awg.query_multiple(["a?", "b?", "c?"]) == ["A?", "B?", "C?"]
+    assert awg.instance.log == ["a?;:b?;:c?"]
+
+
+def test_query_multiple_falls_back_on_short_reply():
+    awg = make_awg(compound=False)
+
+    assert awg.query_multiple(["a?", "b?"]) == ["A?", "B?"]
+    assert awg.instance.log == ["a?;:b?", "*cls", "a?", "b?"]
+
+
+def test_query_multiple_falls_back_on_instrument_error():
+    awg = make_awg(compound=socketscpi.SockInstError(["-113"]))
+
+    assert awg.query_multiple(["a?", "b?"]) == ["A?", "B?"]
+    assert awg.instance.log == ["a?;:b?", "*cls", "a?", "b?"]
+
+
+def test_query_multiple_does_not_retry_after_timeout():
+    # socketscpi surfaces a timeout as an UnboundLocalError, retrying would only stall again
+    awg = make_awg(compound=UnboundLocalError("result"))
+
+    with pytest.raises(UnboundLocalError):
+        awg.query_multiple(["a?", "b?"])
+    assert awg.instance.log == ["a?;:b?"]
+
+
+def test_next_segment_counts_up_locally():
+    awg = make_awg()
+    wfm = np.full(1280, 0.5)
+
+    assert awg.download_wfm(wfm) == 3
+    awg.instance.log.clear()
+    assert awg.download_wfm(wfm) == 4
+    assert awg.download_wfm(wfm, ch=2) == 3
+    # Only the new channel needs the catalog, and no download queries the error queue
+    assert [cmd for cmd in awg.instance.log if cmd.endswith("?")] == ["trace2:catalog?"]
+
+
+def test_segment_cache_cleared_by_failed_download():
+    awg = make_awg()
+    wfm = np.full(1280, 0.5)
+    awg.download_wfm(wfm)
+
+    awg.instance.fail = "trace1:def"
+    with pytest.raises(socketscpi.SockInstError):
+        awg.download_wfm(wfm)
+    assert 1 not in awg.nextSegment
+
+    awg.instance.fail = None
+    awg.instance.log.clear()
+    assert awg.download_wfm(wfm) == 3
+    assert "trace1:catalog?" in awg.instance.log
+
+
+def test_segment_cache_cleared_by_err_check():
+    awg = make_awg()
+    awg.download_wfm(np.full(1280, 0.5))
+
+    awg.instance.errors = ['-222,"Data out of range"\n']
+    with pytest.raises(error.InstrumentError):
+        awg.err_check()
+    assert awg.nextSegment == {}
+
+
+def test_clear_segment_cache():
+    awg = make_awg()
+    wfm = np.full(1280, 0.5)
+    awg.download_wfm(wfm, ch=1)
+    awg.download_wfm(wfm, ch=2)
+
+    awg.clear_segment_cache(2)
+    assert list(awg.nextSegment) == [1]
+    awg.download_wfm(wfm, ch=2)
+    awg.delete_segment(wfmID=3, ch=2)
+    assert list(awg.nextSegment) == [1]
+    awg.clear_all_wfm()
+    assert awg.nextSegment == {}
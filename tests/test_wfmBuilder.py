@@ -0,0 +1,161 @@
+import numpy as np
+import pytest
+
+from pyarbtools import wfmBuilder
+
+
+def test_barker_real_one_sample_per_code_element():
+    # A 13 us Barker 13 pulse at 1 MSa/s has exactly one sample per code element
+    fs = 1e6
+    cf = 100e3
+    real = wfmBuilder.barker_generator(fs=fs, pWidth=13e-6, pri=20e-6, code="b13", cf=cf, wfmFormat="real")
+
+    code = np.array([1, 1, 1, 1, 1, -1, -1, 1, 1, -1, 1, -1, 1])
+    n = np.arange(code.size) - code.size / 2
+    expected = np.cos(np.pi / 2 * code + 2 * np.pi * cf / fs * n)
+
+    assert real.shape == (20,)
+    np.testing.assert_allclose(real[: code.size], expected)
+    assert not real[code.size :].any()
+
+
+def test_barker_iq_one_sample_per_code_element():
+    iq = wfmBuilder.barker_generator(fs=1e6, pWidth=13e-6, pri=20e-6, code="b13", wfmFormat="iq")
+
+    code = np.array([1, 1, 1, 1, 1, -1, -1, 1, 1, -1, 1, -1, 1])
+    np.testing.assert_allclose(iq[: code.size], np.exp(1j * np.pi / 2 * code))
+    assert not iq[code.size :].any()
+
+
+@pytest.mark.parametrize("dtype", [bool, np.int8, np.uint8, np.int16, np.int64, np.float64])
+def test_bits_to_symbols_bit_dtypes(dtype):
+    # Two whole 3 bit symbols, the leftover bit is ignored
+    bits = np.array([1, 0, 1, 0, 1, 1, 1], dtype=dtype)
+
+    symbols = wfmBuilder.bits_to_symbols(bits, 3)
+
+    np.testing.assert_array_equal(symbols, [5, 3])
+
+
+def test_bits_to_symbols_list():
+    np.testing.assert_array_equal(wfmBuilder.bits_to_symbols([1, 1, 0, 1, 0, 0, 1, 0], 8), [0b11010010])
+
+
+@pytest.mark.parametrize("bits", [np.array([0, 2], dtype=np.uint8), np.array([0, -1], dtype=np.int8), np.array([0, 2]), np.array([0.5, 1.0])])
+def test_bits_to_symbols_rejects_non_binary_values(bits):
+    with pytest.raises(ValueError):
+        wfmBuilder.bits_to_symbols(bits, 1)
+
+
+MAPPED_MODULATORS = [
+    (wfmBuilder.bpsk_modulator, wfmBuilder.bpskMap),
+    (wfmBuilder.qpsk_modulator, wfmBuilder.qpskMap),
+    (wfmBuilder.psk8_modulator, wfmBuilder.psk8Map),
+    (wfmBuilder.psk16_modulator, wfmBuilder.psk16Map),
+    (wfmBuilder.qam16_modulator, wfmBuilder.qam16Map),
+    (wfmBuilder.qam32_modulator, wfmBuilder.qam32Map),
+    (wfmBuilder.qam64_modulator, wfmBuilder.qam64Map),
+    (wfmBuilder.qam128_modulator, wfmBuilder.qam128Map),
+    (wfmBuilder.qam256_modulator, wfmBuilder.qam256Map),
+]
+
+
+@pytest.mark.parametrize("modulator, symbolMap", MAPPED_MODULATORS)
+def test_modulator_matches_symbol_map(modulator, symbolMap):
+    keys = sorted(symbolMap, reverse=True)
+    bits = np.array([int(b) for key in keys for b in key], dtype=np.uint8)
+
+    iq = modulator(bits)
+
+    assert iq.dtype == np.complex64
+    np.testing.assert_array_equal(iq, np.array([symbolMap[key] for key in keys], dtype=np.complex64))
+
+
+@pytest.mark.parametrize("modulator, symbolMap", MAPPED_MODULATORS + [(wfmBuilder.apsk16_modulator, None)])
+def test_modulator_custom_map(modulator, symbolMap):
+    bitsPerSym = len(next(iter(symbolMap))) if symbolMap else 4
+    keys = [format(i, f"0{bitsPerSym}b") for i in range(2 ** bitsPerSym)]
+    customMap = {key: complex(i, -i) for i, key in enumerate(keys)}
+    bits = np.array([int(b) for key in reversed(keys) for b in key], dtype=np.uint8)
+
+    iq = modulator(bits, customMap=customMap)
+
+    np.testing.assert_array_equal(iq, [complex(i, -i) for i in reversed(range(2 ** bitsPerSym))])
+
+
+@pytest.mark.parametrize("modulator, symbolMap", MAPPED_MODULATORS + [(wfmBuilder.apsk16_modulator, None)])
+def test_modulator_incomplete_custom_map(modulator, symbolMap):
+    bitsPerSym = len(next(iter(symbolMap))) if symbolMap else 4
+    customMap = {format(i, f"0{bitsPerSym}b"): 1 + 0j for i in range(2 ** bitsPerSym - 1)}
+
+    with pytest.raises(ValueError, match="1" * bitsPerSym):
+        modulator(np.ones(bitsPerSym, dtype=np.uint8), customMap=customMap)
+
+
+def test_symbol_maps_are_read_only():
+    with pytest.raises(TypeError):
+        wfmBuilder.qpskMap["00"] = 0j
+
+
+def test_qam32_map():
+    points = list(wfmBuilder.qam32Map.values())
+    assert len(wfmBuilder.qam32Map) == 32
+    assert len(set(points)) == 32
+    # Cross constellation: a 6x6 grid of odd coordinates without its four corners
+    assert all(abs(p.real) <= 5 and abs(p.imag) <= 5 and not (abs(p.real) == 5 and abs(p.imag) == 5) for p in points)
+
+    # Quasi-Gray: 6 of the 52 pairs of adjacent points differ by more than 1 bit
+    keys = {point: key for key, point in wfmBuilder.qam32Map.items()}
+    pairs = [(keys[p], keys[p + step]) for p in keys for step in (2, 2j) if p + step in keys]
+    assert len(pairs) == 52
+    assert sum(sum(a != b for a, b in zip(k1, k2)) > 1 for k1, k2 in pairs) == 6
+
+
+def repeating_bits(monkeypatch, pattern):
+    """Makes digmod_generator() draw a repeating bit pattern instead of random bits."""
+    monkeypatch.setattr(np.random, "randint", lambda low, high, size, dtype=None: np.tile(pattern, size // len(pattern)).astype(dtype))
+
+
+@pytest.mark.parametrize("fs", [20e6, 10e6, 40e6, 30e6, 7.5e6])
+@pytest.mark.parametrize("filt", ["raisedcosine", "rootraisedcosine"])
+def test_digmod_exactly_periodic(monkeypatch, fs, filt):
+    # 8 qam64 symbols, tiled 3 times, must give exactly 3 periods of the 8 symbol waveform
+    repeating_bits(monkeypatch, np.random.default_rng(3).integers(0, 2, 6 * 8).astype(np.uint8))
+
+    single = wfmBuilder.digmod_generator(fs=fs, symRate=1e6, modType="qam64", numSymbols=8, filt=filt)
+    triple = wfmBuilder.digmod_generator(fs=fs, symRate=1e6, modType="qam64", numSymbols=24, filt=filt)
+
+    assert single.size == 8 * fs / 1e6
+    np.testing.assert_allclose(triple, np.tile(single, 3), rtol=0, atol=1e-6)
+
+
+@pytest.mark.parametrize("fs", [20e6, 10e6, 40e6])
+def test_digmod_symbols_on_sample_grid(monkeypatch, fs):
+    # A raised cosine filter has no intersymbol interference at the symbol instants
+    bits = np.random.default_rng(3).integers(0, 2, 4 * 50).astype(np.uint8)
+    repeating_bits(monkeypatch, bits)
+
+    iq = wfmBuilder.digmod_generator(fs=fs, symRate=1e6, modType="qam16", numSymbols=50, filt="raisedcosine")
+
+    ratio = iq[:: int(fs / 1e6)] / wfmBuilder.qam16_modulator(bits)
+    np.testing.assert_allclose(ratio, ratio[0], atol=1e-5)
+
+
+@pytest.mark.parametrize("modType", ["bpsk", "qpsk", "psk8", "apsk32", "qam32", "qam256"])
+@pytest.mark.parametrize("fs", [20e6, 30e6, 7.5e6])
+def test_digmod_peak_magnitude(modType, fs):
+    iq = wfmBuilder.digmod_generator(fs=fs, symRate=1e6, modType=modType, numSymbols=200, filt="rootraisedcosine")
+
+    assert iq.dtype == np.complex64
+    np.testing.assert_allclose(np.abs(iq).max(), 0.707, rtol=1e-6)
+
+
+@pytest.mark.parametrize("numSymbols", [1, 2, 3])
+@pytest.mark.parametrize("fs, symbolMultiple", [(20e6, 1), (10e6, 2), (30e6, 2)])
+def test_digmod_short_symbol_counts(numSymbols, fs, symbolMultiple):
+    iq = wfmBuilder.digmod_generator(fs=fs, symRate=1e6, modType="qpsk", numSymbols=numSymbols, filt="rootraisedcosine")
+
+    # The symbol count is raised to a multiple of the resampling denominator so the waveform has a whole number of samples
+    assert iq.size == np.lcm(numSymbols, symbolMultiple) * fs / 1e6
+    assert np.isfinite(iq).all()
+    np.testing.assert_allclose(np.abs(iq).max(), 0.707, rtol=1e-6)